@@ -1,126 +1,258 @@
-from fastapi import APIRouter, HTTPException
-from backend.app.models.request_models import RepoAnalyzeRequest
-from backend.app.utils.validators import validate_github_repo_url
-
-from backend.app.services.structure_analyzer import analyze_structure
-from backend.app.services.github_service import (
-    extract_owner_repo,
-    fetch_repo_metadata,
-    fetch_commit_stats,
-    fetch_languages,
-    clone_repository
+import json
+import queue
+import threading
+import time
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from backend.app.config import BATCH_MAX_REPOS, ORG_SCAN_MAX_REPOS, ANALYSIS_MAX_DEADLINE_SECONDS
+from backend.app.models.request_models import (
+    AnalysisDepth,
+    RepoAnalyzeRequest,
+    BatchAnalyzeRequest,
+    OrgAnalyzeRequest
 )
-from backend.app.services.code_quality_analyzer import analyze_code_quality
-from backend.app.services.documentation_analyzer import analyze_documentation
-from backend.app.services.testing_analyzer import analyze_testing
-from backend.app.services.git_practices_analyzer import analyze_git_practices
-
-from backend.app.core.scoring_engine import calculate_final_score
-from backend.app.services.ai_summary_service import generate_repo_summary
-from backend.app.services.ai_roadmap_service import generate_dynamic_roadmap
-from backend.app.services.ai_repo_explainer import generate_repo_explanation
-from backend.app.services.documentation_analyzer import get_readme_content
-import os
+from backend.app.utils.validators import validate_github_repo_url, validate_github_account
+
+from backend.app.services.github_service import extract_owner_repo
+from backend.app.core.analysis_pipeline import AnalysisError, run_analysis
+from backend.app.core.jobs import JobQueueFull, job_manager
+from backend.app.core.batch import iter_batch_results, summarize_batch
+from backend.app.core.org_scan import iter_org_scan, select_repositories
 
 router = APIRouter(prefix="/analyze", tags=["Repository Analysis"])
 
+# Stages pushed to /analyze/stream clients, in the order they usually finish
+STREAMED_STAGES = [
+    "metadata",
+    "structure",
+    "code_quality",
+    "documentation",
+    "project_overview",
+    "testing",
+    "git_practices",
+    "score",
+    "summary",
+    "roadmap"
+]
 
-@router.post("/")
-def analyze_repository(request: RepoAnalyzeRequest):
-    repo_url = str(request.repo_url)
+SSE_KEEPALIVE_SECONDS = 15
 
-    # 1. Validate URL
+
+def parse_repo_url(repo_url: str) -> tuple[str, str]:
     if not validate_github_repo_url(repo_url):
         raise HTTPException(status_code=400, detail="Invalid GitHub repository URL")
 
-    # 2. Extract owner/repo
-    owner, repo = extract_owner_repo(repo_url)
+    return extract_owner_repo(repo_url)
+
+
+def parse_deadline(seconds: float | None) -> float | None:
+    # X-Request-Deadline: seconds the caller is willing to wait
+    if seconds is None:
+        return None
+    if seconds <= 0:
+        raise HTTPException(status_code=400, detail="X-Request-Deadline must be a positive number of seconds")
 
-    # 3. Metadata
+    return min(seconds, ANALYSIS_MAX_DEADLINE_SECONDS)
+
+
+@router.post("/")
+def analyze_repository(
+    request: RepoAnalyzeRequest,
+    x_request_deadline: float | None = Header(default=None)
+):
+    repo_url = str(request.repo_url)
+    owner, repo = parse_repo_url(repo_url)
+    deadline_seconds = parse_deadline(x_request_deadline)
+
+    # Run the stage graph (metadata, clone, analyzers, scoring, AI)
     try:
-        metadata = fetch_repo_metadata(owner, repo)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        return run_analysis(
+            repo_url, owner, repo, depth=request.depth, deadline_seconds=deadline_seconds
+        )
+    except AnalysisError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+
+@router.post("/jobs", status_code=202)
+def create_analysis_job(
+    request: RepoAnalyzeRequest,
+    x_request_deadline: float | None = Header(default=None)
+):
+    repo_url = str(request.repo_url)
+    owner, repo = parse_repo_url(repo_url)
+    deadline_seconds = parse_deadline(x_request_deadline)
 
-    # 4. Clone
     try:
-        local_repo_path = clone_repository(repo_url, repo)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Repository clone failed: {e}")
-
-    # 5. Analysis
-    structure = analyze_structure(local_repo_path)
-    code_quality = analyze_code_quality(local_repo_path)
-    documentation = analyze_documentation(
-        local_repo_path,
-        code_quality.total_lines_of_code
-    )
-    readme_text = get_readme_content(local_repo_path)
+        job = job_manager.submit(repo_url, owner, repo, request.depth, deadline_seconds)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
-    repo_explanation = generate_repo_explanation(
-        repo,
-        readme_text
-    )
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"{router.prefix}/jobs/{job.id}"
+    }
 
-    testing = analyze_testing(local_repo_path)
-    git_practices = analyze_git_practices(owner, repo)
 
-    # 6. Scoring
-    score = calculate_final_score(
-        structure,
-        code_quality,
-        documentation,
-        testing,
-        git_practices
-    )
+@router.get("/jobs/{job_id}")
+def get_analysis_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return job.to_dict()
+
 
-    # 7. Summary (safe – fallback inside)
-    summary = generate_repo_summary(
-        repo,
-        score,
-        structure,
-        code_quality,
-        documentation,
-        testing,
-        git_practices
+def format_sse(event: str, data) -> str:
+    if isinstance(data, BaseModel):
+        data = data.dict()
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def cached_stage_events(result: dict):
+    analysis = result["analysis"]
+    for stage in STREAMED_STAGES:
+        if stage in analysis:
+            yield format_sse(stage, analysis[stage])
+        elif stage in result:
+            yield format_sse(stage, result[stage])
+
+
+def iter_analysis_events(
+    repo_url: str,
+    owner: str,
+    repo: str,
+    depth: str = "standard",
+    deadline_seconds: float | None = None
+):
+    events = queue.Queue()
+
+    def on_stage(name, status, result):
+        if name in STREAMED_STAGES and status in ("completed", "fallback"):
+            events.put(("stage", name, result))
+
+    def worker():
+        try:
+            result = run_analysis(
+                repo_url, owner, repo,
+                on_stage=on_stage,
+                depth=depth,
+                deadline_seconds=deadline_seconds
+            )
+            events.put(("complete", None, result))
+        except AnalysisError as e:
+            events.put(("error", None, {"status_code": e.status_code, "detail": e.detail}))
+        except Exception as e:
+            events.put(("error", None, {"status_code": 500, "detail": f"Analysis failed: {e}"}))
+
+    threading.Thread(target=worker, name="analysis-stream", daemon=True).start()
+
+    streamed = False
+    while True:
+        try:
+            kind, name, payload = events.get(timeout=SSE_KEEPALIVE_SECONDS)
+        except queue.Empty:
+            # Comment line keeps proxies from closing an idle connection
+            yield ": keep-alive\n\n"
+            continue
+
+        if kind == "stage":
+            streamed = True
+            yield format_sse(name, payload)
+        elif kind == "complete":
+            # Cache hits skip the pipeline, so replay the stored stages
+            if not streamed:
+                yield from cached_stage_events(payload)
+            yield format_sse("complete", payload)
+            return
+        else:
+            yield format_sse("error", payload)
+            return
+
+
+@router.get("/stream")
+def stream_analysis(
+    repo_url: str,
+    depth: AnalysisDepth = "standard",
+    x_request_deadline: float | None = Header(default=None)
+):
+    owner, repo = parse_repo_url(repo_url)
+    deadline_seconds = parse_deadline(x_request_deadline)
+
+    return StreamingResponse(
+        iter_analysis_events(repo_url, owner, repo, depth, deadline_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
-    # 8. Roadmap (FIXED)
-    roadmap = generate_dynamic_roadmap(
-    repo,
-    score,
-    structure,
-    code_quality,
-    documentation,
-    testing,
-    git_practices
-)
 
+def iter_batch_ndjson(repo_urls: list[str]):
+    start = time.perf_counter()
+    items = []
 
-    # 9. Extra metadata
-    commits = fetch_commit_stats(owner, repo)
-    languages = fetch_languages(owner, repo)
+    for index, item in iter_batch_results(repo_urls):
+        items.append(item)
+        yield json.dumps({"type": "result", "index": index, **item}, default=str) + "\n"
 
-    ai_used = "GROQ_API_KEY" in os.environ
+    summary = summarize_batch(items, time.perf_counter() - start)
+    yield json.dumps({"type": "summary", **summary}) + "\n"
+
+
+@router.post("/batch")
+def analyze_batch(request: BatchAnalyzeRequest):
+    repo_urls = request.repo_urls
+    if not repo_urls:
+        raise HTTPException(status_code=400, detail="repo_urls must not be empty")
+    if len(repo_urls) > BATCH_MAX_REPOS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch may contain at most {BATCH_MAX_REPOS} repositories"
+        )
+
+    # Streamed batches send one NDJSON line per repository as it finishes
+    if request.stream:
+        return StreamingResponse(
+            iter_batch_ndjson(repo_urls),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    start = time.perf_counter()
+    items = [None] * len(repo_urls)
+    for index, item in iter_batch_results(repo_urls):
+        items[index] = item
 
     return {
-    "status": "completed",
-    "repository": f"{owner}/{repo}",
-    "score": score.dict(),
-
-    "project_overview": repo_explanation,   # ✅ NEW
-
-    "summary": summary,
-    "roadmap": roadmap.dict(),
-
-    "analysis": {
-        "structure": structure.dict(),
-        "code_quality": code_quality.dict(),
-        "project_overview": repo_explanation,
-        "documentation": documentation.dict(),
-        "testing": testing.dict(),
-        "git_practices": git_practices.dict()
+        "results": items,
+        "summary": summarize_batch(items, time.perf_counter() - start)
     }
-}
 
-    
+
+@router.post("/org")
+def analyze_org(request: OrgAnalyzeRequest):
+    if not validate_github_account(request.account):
+        raise HTTPException(status_code=400, detail="Invalid GitHub user or organization name")
+
+    max_repos = min(request.max_repos or ORG_SCAN_MAX_REPOS, ORG_SCAN_MAX_REPOS)
+
+    # Listing errors (unknown account, API failures) are reported before
+    # the stream starts
+    try:
+        repos = select_repositories(
+            request.account,
+            language=request.language,
+            include_archived=request.include_archived,
+            include_forks=request.include_forks,
+            pushed_after=request.pushed_after,
+            max_repos=max_repos
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        (json.dumps(line, default=str) + "\n" for line in iter_org_scan(request.account, repos)),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
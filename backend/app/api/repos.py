@@ -0,0 +1,77 @@
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, HTTPException, Query
+
+from backend.app.config import HISTORY_MAX_POINTS
+from backend.app.models.request_models import AnalysisDepth
+from backend.app.services.history_store import history_store
+
+router = APIRouter(prefix="/repos", tags=["Analysis History"])
+
+
+def to_timestamp(value: datetime | None) -> float | None:
+    # Datetimes without a timezone are taken as UTC, not server local time
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+@router.get("/top")
+def top_repositories(
+    limit: int = Query(10, ge=1, le=100),
+    since: datetime | None = None,
+    include_partial: bool = False
+):
+    """
+    Highest-scoring repositories in the history, one entry per repository
+    with its best analysis. Partial analyses (cut short by the deadline,
+    or degraded by a fallback) are left out unless include_partial is set.
+    """
+    repositories = history_store.top(
+        limit, since=to_timestamp(since), include_partial=include_partial
+    )
+    return {"repositories": repositories}
+
+
+@router.get("/{owner}/{repo}/history")
+def repository_history(
+    owner: str,
+    repo: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    depth: AnalysisDepth | None = None,
+    limit: int = Query(HISTORY_MAX_POINTS, ge=1, le=HISTORY_MAX_POINTS)
+):
+    """
+    Score time series of every stored analysis, oldest first.
+    """
+    points = history_store.history(
+        owner,
+        repo,
+        since=to_timestamp(since),
+        until=to_timestamp(until),
+        depth=depth,
+        limit=limit
+    )
+    return {"repository": f"{owner}/{repo}", "points": points}
+
+
+@router.get("/{owner}/{repo}/latest")
+def latest_analysis(
+    owner: str,
+    repo: str,
+    depth: AnalysisDepth | None = None,
+    include_partial: bool = False
+):
+    """
+    The most recent stored analysis, without re-analyzing the repository.
+    Partial analyses (cut short by the deadline, or degraded by a
+    fallback) are only returned with include_partial.
+    """
+    result = history_store.latest(owner, repo, depth=depth, include_partial=include_partial)
+    if result is None:
+        raise HTTPException(status_code=404, detail="No stored analysis for this repository")
+
+    return {**result, "cached": True}
@@ -6,12 +6,123 @@ load_dotenv(override=True)
 GITHUB_API_BASE = "https://api.github.com"
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 
+# Extra tokens (comma separated); requests go to the token with the most
+# rate limit left
+GITHUB_TOKENS = [
+    t.strip()
+    for t in [GITHUB_TOKEN or "", *os.getenv("GITHUB_TOKENS", "").split(",")]
+    if t.strip()
+]
+GITHUB_TOKENS = list(dict.fromkeys(GITHUB_TOKENS))
+
+# How long a caller may wait for a token's rate limit to reset before failing
+GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS", "60"))
+
+# Shared GitHub HTTP client
+GITHUB_POOL_SIZE = int(os.getenv("GITHUB_POOL_SIZE", "32"))
+GITHUB_RETRIES = int(os.getenv("GITHUB_RETRIES", "3"))
+GITHUB_CONNECT_TIMEOUT_SECONDS = float(os.getenv("GITHUB_CONNECT_TIMEOUT_SECONDS", "5"))
+GITHUB_READ_TIMEOUT_SECONDS = float(os.getenv("GITHUB_READ_TIMEOUT_SECONDS", "30"))
+GITHUB_ETAG_CACHE_SIZE = int(os.getenv("GITHUB_ETAG_CACHE_SIZE", "2048"))
+
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
+# LLM calls share one async client; the summary, roadmap and explanation
+# calls of a request must all finish within LLM_DEADLINE_SECONDS
+LLM_MODEL = os.getenv("LLM_MODEL", "llama-3.1-8b-instant")
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "30"))
+
+# Approximate token budget for the README digest sent to the explainer
+README_TOKEN_BUDGET = int(os.getenv("README_TOKEN_BUDGET", "1500"))
+
+# Completions cached by model, temperature and normalized prompt
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", "data/cache/llm")
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Worker threads used to run independent analysis stages concurrently
+PIPELINE_WORKERS = int(os.getenv("PIPELINE_WORKERS", "8"))
+
+# How source is obtained: "tarball" streams the GitHub tarball into memory,
+# "clone" checks the repository out from the local mirror store
+REPO_ACQUISITION = os.getenv("REPO_ACQUISITION", "tarball")
+TARBALL_MAX_FILE_BYTES = int(os.getenv("TARBALL_MAX_FILE_BYTES", str(1024 * 1024)))
+TARBALL_MAX_TOTAL_BYTES = int(os.getenv("TARBALL_MAX_TOTAL_BYTES", str(256 * 1024 * 1024)))
+
+# Local mirror store: bare mirrors plus one checkout per analyzed commit
+CLONE_STORE_DIR = os.getenv("CLONE_STORE_DIR", "data/cloned_repos")
+CLONE_STORE_MAX_BYTES = int(os.getenv("CLONE_STORE_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+CLONE_STORE_MIN_IDLE_SECONDS = int(os.getenv("CLONE_STORE_MIN_IDLE_SECONDS", "900"))
+# Concurrent git fetches across all analyses in this process
+CLONE_WORKERS = int(os.getenv("CLONE_WORKERS", "4"))
+
+# Commits of history fetched (treeless) for the local git practice analysis
+GIT_HISTORY_DEPTH = int(os.getenv("GIT_HISTORY_DEPTH", "10000"))
+
+# Cyclomatic complexity (radon) runs in a process pool for larger repos
+COMPLEXITY_WORKERS = int(os.getenv("COMPLEXITY_WORKERS", str(os.cpu_count() or 1)))
+COMPLEXITY_INLINE_MAX_FILES = int(os.getenv("COMPLEXITY_INLINE_MAX_FILES", "20"))
+
+# pylint runs in parallel shards, each with its own timeout
+PYLINT_WORKERS = int(os.getenv("PYLINT_WORKERS", str(os.cpu_count() or 1)))
+PYLINT_SHARD_MAX_FILES = int(os.getenv("PYLINT_SHARD_MAX_FILES", "50"))
+PYLINT_SHARD_TIMEOUT_SECONDS = int(os.getenv("PYLINT_SHARD_TIMEOUT_SECONDS", "120"))
+
+# Very large repositories are analyzed from a stratified random sample of
+# SAMPLE_FILES Python files (by top-level directory and size): pylint and
+# radon only run on the sample, and the scores are reported as estimates
+# with confidence intervals. Deep analyses always cover every file.
+SAMPLING_MIN_FILES = int(os.getenv("SAMPLING_MIN_FILES", "1500"))
+SAMPLING_MIN_LINES = int(os.getenv("SAMPLING_MIN_LINES", "300000"))
+SAMPLE_FILES = int(os.getenv("SAMPLE_FILES", "400"))
+SAMPLING_MAX_DIRECTORIES = int(os.getenv("SAMPLING_MAX_DIRECTORIES", "8"))
+SAMPLING_CONFIDENCE = float(os.getenv("SAMPLING_CONFIDENCE", "0.95"))
+
+# Analysis depth tiers: "quick" skips pylint, the LLM and the local git
+# history; "deep" lints with a longer shard timeout, lists every complexity
+# block and reads a longer git history
+DEEP_PYLINT_SHARD_TIMEOUT_SECONDS = int(os.getenv("DEEP_PYLINT_SHARD_TIMEOUT_SECONDS", "600"))
+DEEP_GIT_HISTORY_DEPTH = int(os.getenv("DEEP_GIT_HISTORY_DEPTH", "100000"))
+
+# Every analysis runs against a deadline: the X-Request-Deadline header
+# (seconds, capped at ANALYSIS_MAX_DEADLINE_SECONDS) or
+# ANALYSIS_DEADLINE_SECONDS. Stages cut off by it are skipped and the score
+# covers whatever finished; stages that ignore it are abandoned
+# DEADLINE_GRACE_SECONDS later.
+ANALYSIS_DEADLINE_SECONDS = float(os.getenv("ANALYSIS_DEADLINE_SECONDS", "300"))
+ANALYSIS_MAX_DEADLINE_SECONDS = float(os.getenv("ANALYSIS_MAX_DEADLINE_SECONDS", "900"))
+DEADLINE_GRACE_SECONDS = float(os.getenv("DEADLINE_GRACE_SECONDS", "2"))
+
+# Background analysis jobs (POST /analyze/jobs)
+ANALYSIS_JOB_WORKERS = int(os.getenv("ANALYSIS_JOB_WORKERS", "2"))
+ANALYSIS_JOB_MAX_PENDING = int(os.getenv("ANALYSIS_JOB_MAX_PENDING", "50"))
+ANALYSIS_JOB_TTL_SECONDS = int(os.getenv("ANALYSIS_JOB_TTL_SECONDS", "3600"))
+
+# Batch analysis (POST /analyze/batch): analyses running at once across
+# all batches, and the largest accepted batch. Analyses spend much of their
+# time waiting on the network; radon and pylint are bounded by their own
+# shared pools.
+BATCH_PARALLELISM = int(os.getenv("BATCH_PARALLELISM", str(max(4, os.cpu_count() or 1))))
+BATCH_MAX_REPOS = int(os.getenv("BATCH_MAX_REPOS", "100"))
+
+# Largest number of repositories POST /analyze/org analyzes per account
+ORG_SCAN_MAX_REPOS = int(os.getenv("ORG_SCAN_MAX_REPOS", "500"))
+
+# Analysis results, keyed by repository and HEAD commit
+RESULT_CACHE_MEMORY_MAX_BYTES = int(os.getenv("RESULT_CACHE_MEMORY_MAX_BYTES", str(64 * 1024 * 1024)))
+RESULT_CACHE_MEMORY_TTL_SECONDS = int(os.getenv("RESULT_CACHE_MEMORY_TTL_SECONDS", "600"))
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR", "data/cache/results")
+RESULT_CACHE_DISK_MAX_BYTES = int(os.getenv("RESULT_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))
+RESULT_CACHE_DISK_TTL_SECONDS = int(os.getenv("RESULT_CACHE_DISK_TTL_SECONDS", str(6 * 3600)))
+
+# Every completed analysis is kept in this SQLite database for the
+# /repos/{owner}/{repo}/history and /latest endpoints
+HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", "data/history.db")
+HISTORY_MAX_POINTS = int(os.getenv("HISTORY_MAX_POINTS", "1000"))
 
 
-if not GITHUB_TOKEN:
+if not GITHUB_TOKENS:
     print("⚠️ WARNING: GITHUB_TOKEN not loaded")
 else:
-    print("✅ GITHUB_TOKEN loaded")
+    print(f"✅ GITHUB_TOKEN loaded ({len(GITHUB_TOKENS)} token(s))")
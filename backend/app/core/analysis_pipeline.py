@@ -0,0 +1,538 @@
+from typing import Any, Callable
+
+from backend.app.config import (
+    PIPELINE_WORKERS,
+    REPO_ACQUISITION,
+    README_TOKEN_BUDGET,
+    PYLINT_SHARD_TIMEOUT_SECONDS,
+    GIT_HISTORY_DEPTH,
+    DEEP_PYLINT_SHARD_TIMEOUT_SECONDS,
+    DEEP_GIT_HISTORY_DEPTH,
+    LLM_DEADLINE_SECONDS,
+    ANALYSIS_DEADLINE_SECONDS,
+    DEADLINE_GRACE_SECONDS
+)
+from backend.app.core.pipeline import Stage, StageError, StageSkipped, run_pipeline
+from backend.app.core.scoring_engine import calculate_final_score
+from backend.app.services.github_service import (
+    fetch_repository_facts,
+    commit_stats_from_commits,
+    resolve_head_sha
+)
+from backend.app.services.clone_store import checkout_repository
+from backend.app.services.repo_scanner import RepoManifest, scan_repository
+from backend.app.services.tarball_loader import load_repository_tarball
+from backend.app.services.result_cache import (
+    analysis_cache_key,
+    get_cached_analysis,
+    store_analysis
+)
+from backend.app.services.history_store import record_analysis
+from backend.app.services.source_index import build_source_index
+from backend.app.services.structure_analyzer import analyze_structure
+from backend.app.services.code_quality_analyzer import analyze_code_quality
+from backend.app.services.documentation_analyzer import (
+    analyze_documentation,
+    get_readme_content
+)
+from backend.app.services.readme_condenser import condense_readme
+from backend.app.services.testing_analyzer import analyze_testing
+from backend.app.services.git_practices_analyzer import git_practices_from_facts
+from backend.app.services.git_history_analyzer import analyze_git_history
+from backend.app.core.llm_orchestrator import (
+    start_repo_explanation,
+    run_llm_fanout,
+    rule_based_results,
+    fallback_results
+)
+from backend.app.utils.deadline import (
+    DeadlineExceeded,
+    current_deadline,
+    deadline_expired,
+    request_deadline,
+    time_left
+)
+from backend.app.utils.metrics import (
+    ANALYSES_IN_FLIGHT,
+    FALLBACKS,
+    STAGE_SECONDS,
+    record_timing,
+    timed_stage
+)
+
+
+def acquire_manifest(repo_url: str, owner: str, repo: str, head_sha: str | None) -> RepoManifest:
+    """
+    Loads the repository tree for the filesystem analyzers. Tarball mode
+    avoids git and disk entirely and falls back to a checkout on failure.
+    """
+    if REPO_ACQUISITION == "tarball":
+        try:
+            with timed_stage("tarball"):
+                return load_repository_tarball(owner, repo, head_sha)
+        except Exception as e:
+            print("[TARBALL FALLBACK] using a git checkout instead:", e)
+            FALLBACKS.labels("tarball").inc()
+
+    with timed_stage("clone"):
+        checkout = checkout_repository(repo_url, owner, repo, head_sha)
+    return scan_repository(checkout)
+
+
+def select_git_practices(git_history, github):
+    # Local history is preferred; the API facts cover repos whose history
+    # could not be fetched
+    if git_history is not None:
+        return git_history
+    if github is not None:
+        return git_practices_from_facts(github)
+    raise StageSkipped("Neither local git history nor GitHub facts are available")
+
+
+def skip_on_deadline(error: Exception):
+    # Stages cut off by the request deadline, or left without an input,
+    # are skipped; any other failure still fails the analysis
+    if isinstance(error, (DeadlineExceeded, StageSkipped)) or deadline_expired():
+        return None
+    raise error
+
+
+def needs_inputs(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wraps a stage that needs every input: it is skipped when one of them
+    was skipped, or when the deadline passed before it could start.
+    """
+    def run(**inputs):
+        missing = [name for name, value in inputs.items() if value is None]
+        if missing:
+            raise StageSkipped(f"missing {', '.join(missing)}")
+        time_left()
+        return func(**inputs)
+
+    return run
+
+
+def text_results(results: dict) -> dict | None:
+    # The LLM calls' results or, when the llm stage was cut off, their
+    # rule-based stand-ins
+    return results.get("llm") or results.get("llm_fallback")
+
+
+def text_field(name: str) -> Callable[..., Any]:
+    def field(**results):
+        text = text_results(results)
+        return text and text[name]
+
+    return field
+
+
+class AnalysisError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def build_analysis_stages(
+    repo_url: str,
+    owner: str,
+    repo: str,
+    head_sha: str | None = None,
+    depth: str = "standard"
+) -> list[Stage]:
+    """
+    Declares every analysis step together with the results it needs.
+    Steps without a dependency between them run concurrently. Quick
+    analyses leave out pylint, the LLM calls and the local git history.
+    """
+    analyzers = ("structure", "code_quality", "documentation", "testing", "git_practices")
+    quick = depth == "quick"
+    deep = depth == "deep"
+
+    def score(structure, code_quality, documentation, testing, git_practices):
+        return calculate_final_score(
+            structure, code_quality, documentation, testing, git_practices
+        )
+
+    def fanout(explanation, score, structure, code_quality, documentation, testing, git_practices):
+        return run_llm_fanout(
+            repo, explanation, score,
+            structure, code_quality, documentation, testing, git_practices,
+            timeout=time_left(LLM_DEADLINE_SECONDS)
+        )
+
+    def llm(**inputs):
+        # A skipped stage cancels the explanation call still in flight, so
+        # it does not keep the LLM loop busy
+        try:
+            return needs_inputs(fanout)(**inputs)
+        except Exception:
+            if inputs["explanation"] is not None:
+                inputs["explanation"].cancel()
+            raise
+
+    def code_quality(manifest, source_index):
+        return analyze_code_quality(
+            manifest,
+            source_index,
+            lint=not quick,
+            lint_timeout=DEEP_PYLINT_SHARD_TIMEOUT_SECONDS if deep else PYLINT_SHARD_TIMEOUT_SECONDS,
+            detail=deep
+        )
+
+    def git_history():
+        if quick:
+            return None
+        return analyze_git_history(
+            repo_url, owner, repo,
+            depth=DEEP_GIT_HISTORY_DEPTH if deep else GIT_HISTORY_DEPTH
+        )
+
+    def rules(score, structure, code_quality, documentation, testing, git_practices):
+        return rule_based_results(
+            score, structure, code_quality, documentation, testing, git_practices
+        )
+
+    def llm_fallback(score, structure, code_quality, documentation, testing, git_practices):
+        return fallback_results(
+            score, structure, code_quality, documentation, testing, git_practices
+        )
+
+    if quick:
+        llm_stages = [
+            # Runs on whichever analyzers finished, like the score
+            Stage("llm", rules, ("score",) + analyzers)
+        ]
+        text_stages = ("llm",)
+    else:
+        llm_stages = [
+            # The explanation only needs the README, so it starts during pylint
+            Stage(
+                "readme",
+                needs_inputs(
+                    lambda manifest: condense_readme(get_readme_content(manifest), README_TOKEN_BUDGET)
+                ),
+                ("manifest",),
+                skip_on_deadline
+            ),
+            Stage(
+                "explanation",
+                needs_inputs(lambda readme: start_repo_explanation(repo, readme)),
+                ("readme",),
+                skip_on_deadline
+            ),
+            # All LLM results are collected under one shared deadline
+            Stage("llm", llm, ("explanation", "score") + analyzers, skip_on_deadline),
+            # Rule-based text for when the llm stage is skipped; cheap, and
+            # like the score it runs on whichever analyzers finished
+            Stage("llm_fallback", llm_fallback, ("score",) + analyzers)
+        ]
+        text_stages = ("llm", "llm_fallback")
+
+    # A resolved HEAD proves the repository exists, so GitHub API failures
+    # (e.g. exhausted quota) no longer have to fail the request
+    github_fallback = (lambda e: None) if head_sha else skip_on_deadline
+
+    return [
+        # One GitHub round trip, overlapping with fetching the source
+        Stage("github", lambda: fetch_repository_facts(owner, repo), fallback=github_fallback),
+        Stage("metadata", lambda github: github and github["metadata"], ("github",)),
+        Stage(
+            "commits",
+            lambda github: github and commit_stats_from_commits(github["commits"]),
+            ("github",)
+        ),
+        Stage("languages", lambda github: github and github["languages"], ("github",)),
+
+        # Git practices come from local history, without API calls
+        Stage("git_history", git_history, fallback=lambda e: None),
+        Stage(
+            "git_practices",
+            select_git_practices,
+            ("git_history", "github"),
+            skip_on_deadline
+        ),
+
+        # Filesystem analyzers share one manifest of the source tree. Past
+        # the deadline they are skipped and the score covers the rest.
+        Stage(
+            "manifest",
+            needs_inputs(lambda: acquire_manifest(repo_url, owner, repo, head_sha)),
+            fallback=skip_on_deadline
+        ),
+        # Every Python file is read and parsed once, for all analyzers.
+        # Deep analyses never sample.
+        Stage(
+            "source_index",
+            needs_inputs(lambda manifest: build_source_index(manifest, sample=not deep)),
+            ("manifest",),
+            skip_on_deadline
+        ),
+        Stage(
+            "structure",
+            needs_inputs(
+                lambda manifest, source_index: analyze_structure(manifest, source_index)
+            ),
+            ("manifest", "source_index"),
+            skip_on_deadline
+        ),
+        Stage(
+            "code_quality",
+            needs_inputs(code_quality),
+            ("manifest", "source_index"),
+            skip_on_deadline
+        ),
+        Stage(
+            "documentation",
+            needs_inputs(
+                lambda manifest, source_index: analyze_documentation(manifest, source_index)
+            ),
+            ("manifest", "source_index"),
+            skip_on_deadline
+        ),
+        Stage(
+            "testing",
+            needs_inputs(
+                lambda manifest, source_index: analyze_testing(manifest, source_index)
+            ),
+            ("manifest", "source_index"),
+            skip_on_deadline
+        ),
+
+        # Scoring always runs, on whichever analyzers finished
+        Stage("score", score, analyzers),
+
+        *llm_stages,
+        Stage("project_overview", text_field("project_overview"), text_stages),
+        Stage("summary", text_field("summary"), text_stages),
+        Stage("roadmap", text_field("roadmap"), text_stages),
+    ]
+
+
+def field_tiers(depth: str, results: dict) -> dict[str, str]:
+    """
+    Which tier produced each response field: "quick" for the manifest
+    heuristics, GitHub facts and rule-based text every depth shares, the
+    requested depth for work only it does, and "skipped" for fields it
+    left out.
+    """
+    text = text_results(results)
+    llm_fallbacks = set(text["fallbacks"]) if text else set()
+    code = results["code_quality"]
+
+    def llm_tier(name: str, without_llm: str) -> str:
+        if depth == "quick" or name in llm_fallbacks:
+            return without_llm
+        return "standard"
+
+    return {
+        "metadata": "quick",
+        "commits": "quick",
+        "languages": "quick",
+        "structure": "quick",
+        "code_quality": "quick",
+        "code_quality.pylint_score": "skipped" if code is None or code.pylint_skipped else depth,
+        "code_quality.complexity_detail": "deep" if depth == "deep" else "skipped",
+        "documentation": "quick",
+        "testing": "quick",
+        # Without local history, git practices come from the GitHub facts
+        "git_practices": "quick" if results["git_history"] is None else depth,
+        "score": depth,
+        "project_overview": llm_tier("project_overview", "skipped"),
+        "summary": llm_tier("summary", "quick"),
+        "roadmap": llm_tier("roadmap", "quick")
+    }
+
+
+def stage_outcomes(statuses: dict[str, str], results: dict) -> dict[str, str]:
+    """
+    How each response field finished: "completed", "degraded" (from a
+    fallback or partial input, e.g. pylint shards cut off by the deadline)
+    or "skipped" (no result).
+    """
+    analyzers = ("structure", "code_quality", "documentation", "testing", "git_practices")
+    text = text_results(results)
+    llm_fallbacks = set(text["fallbacks"]) if text else set()
+    code = results["code_quality"]
+
+    def outcome(name: str, degraded: bool = False) -> str:
+        if results[name] is None:
+            return "skipped"
+        if degraded or statuses.get(name) == "fallback":
+            return "degraded"
+        return "completed"
+
+    outcomes = {
+        "metadata": outcome("metadata"),
+        "commits": outcome("commits"),
+        "languages": outcome("languages"),
+        "structure": outcome("structure"),
+        "code_quality": outcome("code_quality", code is not None and code.pylint_partial),
+        "documentation": outcome("documentation"),
+        "testing": outcome("testing"),
+        "git_practices": outcome("git_practices", statuses.get("git_history") == "fallback")
+    }
+    return {
+        **outcomes,
+        # The score is only as complete as the analyzers behind it
+        "score": outcome("score", any(outcomes[a] != "completed" for a in analyzers)),
+        "project_overview": outcome("project_overview", "project_overview" in llm_fallbacks),
+        "summary": outcome("summary", "summary" in llm_fallbacks),
+        "roadmap": outcome("roadmap", "roadmap" in llm_fallbacks)
+    }
+
+
+# Response fields a depth leaves out by design, rather than by failure
+TIER_SKIPPED_FIELDS = {"quick": {"project_overview"}}
+
+
+def is_complete(response: dict) -> bool:
+    """
+    Whether every field finished as its depth intends: nothing cut off
+    by the deadline, degraded by a fallback or skipped after a failure.
+    Only complete results are cached, so a transient failure (an LLM
+    outage, a GitHub error, a failed pylint shard) never pins a worse
+    result on the commit.
+    """
+    by_tier = TIER_SKIPPED_FIELDS.get(response["depth"], set())
+    return not response["deadline_exceeded"] and all(
+        outcome == "completed" or (outcome == "skipped" and field in by_tier)
+        for field, outcome in response["stages"].items()
+    )
+
+
+def dump(model) -> dict | None:
+    return model.dict() if model is not None else None
+
+
+def build_response(
+    owner: str,
+    repo: str,
+    head_sha: str | None,
+    results: dict,
+    depth: str = "standard",
+    statuses: dict[str, str] | None = None
+) -> dict:
+    stages = stage_outcomes(statuses or {}, results)
+    tiers = {
+        field: "skipped" if stages.get(field.split(".")[0]) == "skipped" else tier
+        for field, tier in field_tiers(depth, results).items()
+    }
+
+    return {
+        "status": "completed",
+        "repository": f"{owner}/{repo}",
+        "commit_sha": head_sha,
+        "cached": False,
+        "depth": depth,
+        "tiers": tiers,
+        "stages": stages,
+        "deadline_exceeded": deadline_expired(),
+        "score": results["score"].dict(),
+
+        "project_overview": results["project_overview"],
+
+        "summary": results["summary"],
+        "roadmap": dump(results["roadmap"]),
+
+        "commits": results["commits"],
+        "languages": results["languages"],
+
+        "analysis": {
+            "structure": dump(results["structure"]),
+            "code_quality": dump(results["code_quality"]),
+            "project_overview": results["project_overview"],
+            "documentation": dump(results["documentation"]),
+            "testing": dump(results["testing"]),
+            "git_practices": dump(results["git_practices"])
+        }
+    }
+
+
+def run_analysis(
+    repo_url: str,
+    owner: str,
+    repo: str,
+    on_stage: Callable[[str, str, Any], None] | None = None,
+    depth: str = "standard",
+    deadline_seconds: float | None = None
+) -> dict:
+    """
+    Analyzes the repository within deadline_seconds (default
+    ANALYSIS_DEADLINE_SECONDS). Every stage gets the time left; what the
+    deadline cut off is reported as skipped or degraded.
+    """
+    with request_deadline(deadline_seconds or ANALYSIS_DEADLINE_SECONDS):
+        return _run_analysis(repo_url, owner, repo, on_stage, depth)
+
+
+def _run_analysis(
+    repo_url: str,
+    owner: str,
+    repo: str,
+    on_stage: Callable[[str, str, Any], None] | None,
+    depth: str
+) -> dict:
+    # The HEAD commit identifies the analyzed content; unchanged repos are
+    # served from the result cache without cloning or calling the LLM.
+    try:
+        with timed_stage("resolve_head"):
+            head_sha = resolve_head_sha(repo_url)
+    except Exception as e:
+        print("[RESULT CACHE] could not resolve HEAD, skipping cache:", e)
+        head_sha = None
+
+    cache_key = analysis_cache_key(owner, repo, head_sha, depth) if head_sha else None
+    if cache_key:
+        # Only the requested depth is served: a deeper analysis has its own
+        # depth, tiers and score, which a shallower request must not report
+        with timed_stage("result_cache"):
+            cached = get_cached_analysis(cache_key)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+    stages = build_analysis_stages(repo_url, owner, repo, head_sha, depth)
+    timings = {}
+    statuses = {}
+
+    def track_stage(name, status, result):
+        statuses[name] = status
+        if status == "fallback":
+            FALLBACKS.labels(name).inc()
+        if on_stage is not None:
+            on_stage(name, status, result)
+
+    try:
+        with ANALYSES_IN_FLIGHT.track_inprogress():
+            results = run_pipeline(
+                stages,
+                max_workers=PIPELINE_WORKERS,
+                on_stage=track_stage,
+                timings=timings,
+                deadline=current_deadline(),
+                grace=DEADLINE_GRACE_SECONDS
+            )
+    except StageError as e:
+        if e.stage == "github":
+            raise AnalysisError(400, str(e.error)) from e
+        if e.stage == "manifest":
+            raise AnalysisError(500, f"Repository clone failed: {e.error}") from e
+        raise AnalysisError(500, f"Analysis failed: {e}") from e
+    finally:
+        # Abandoned stages may still add their timing from their own thread
+        for name, seconds in list(timings.items()):
+            STAGE_SECONDS.labels(name).observe(seconds)
+            record_timing(name, seconds)
+
+    response = build_response(owner, repo, head_sha, results, depth, statuses)
+
+    # Partial results are not cached, so the next request can produce the
+    # complete one
+    complete = is_complete(response)
+    if cache_key and complete:
+        store_analysis(cache_key, response)
+
+    # Cache hits returned above; only fresh analyses join the history
+    record_analysis(owner, repo, response, partial=not complete)
+
+    return response
@@ -0,0 +1,95 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator
+
+from backend.app.config import BATCH_PARALLELISM
+from backend.app.core.analysis_pipeline import AnalysisError, run_analysis
+from backend.app.services.github_service import extract_owner_repo
+from backend.app.utils.validators import validate_github_repo_url
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_batch_executor() -> ThreadPoolExecutor:
+    # Shared by every batch, so BATCH_PARALLELISM bounds the analyses
+    # running at once no matter how many batches are in flight
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=BATCH_PARALLELISM, thread_name_prefix="batch")
+        return _executor
+
+
+def analyze_batch_item(repo_url: str, owner: str, repo: str) -> dict:
+    start = time.perf_counter()
+    item = {"repo_url": repo_url, "repository": f"{owner}/{repo}"}
+
+    try:
+        item["status"] = "completed"
+        item["result"] = run_analysis(repo_url, owner, repo)
+    except AnalysisError as e:
+        item["status"] = "failed"
+        item["error"] = {"status_code": e.status_code, "detail": e.detail}
+    except Exception as e:
+        item["status"] = "failed"
+        item["error"] = {"status_code": 500, "detail": f"Analysis failed: {e}"}
+
+    item["duration_seconds"] = round(time.perf_counter() - start, 3)
+    return item
+
+
+def invalid_item(repo_url: str) -> dict:
+    return {
+        "repo_url": repo_url,
+        "repository": None,
+        "status": "failed",
+        "error": {"status_code": 400, "detail": "Invalid GitHub repository URL"},
+        "duration_seconds": 0.0
+    }
+
+
+def iter_batch_results(repo_urls: list[str]) -> Iterator[tuple[int, dict]]:
+    """
+    Analyzes the repositories concurrently and yields (index, item) as
+    each one finishes, so a slow repository never holds back the others.
+    Repeated URLs of the same repository are analyzed once.
+    """
+    by_repo = {}
+    for index, repo_url in enumerate(repo_urls):
+        if not validate_github_repo_url(repo_url):
+            yield index, invalid_item(repo_url)
+            continue
+
+        owner, repo = extract_owner_repo(repo_url)
+        by_repo.setdefault((owner.lower(), repo.lower()), (repo_url, owner, repo, []))[3].append(index)
+
+    executor = get_batch_executor()
+    futures = {
+        executor.submit(analyze_batch_item, repo_url, owner, repo): indexes
+        for repo_url, owner, repo, indexes in by_repo.values()
+    }
+
+    try:
+        for future in as_completed(futures):
+            item = future.result()
+            for index in futures[future]:
+                yield index, {**item, "repo_url": repo_urls[index]}
+    finally:
+        # The client went away: analyses that haven't started are dropped
+        for future in futures:
+            future.cancel()
+
+
+def summarize_batch(items: list[dict], elapsed: float) -> dict:
+    completed = [i for i in items if i["status"] == "completed"]
+    scores = [i["result"]["score"]["total_score"] for i in completed]
+
+    return {
+        "total": len(items),
+        "completed": len(completed),
+        "failed": len(items) - len(completed),
+        "average_score": round(sum(scores) / len(scores), 1) if scores else None,
+        "duration_seconds": round(elapsed, 3)
+    }
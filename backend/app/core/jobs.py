@@ -0,0 +1,132 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from backend.app.config import (
+    ANALYSIS_JOB_WORKERS,
+    ANALYSIS_JOB_MAX_PENDING,
+    ANALYSIS_JOB_TTL_SECONDS
+)
+from backend.app.core.analysis_pipeline import AnalysisError, run_analysis
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+@dataclass
+class AnalysisJob:
+    id: str
+    repo_url: str
+    owner: str
+    repo: str
+    depth: str = "standard"
+    # Counted from when the job starts running, not from when it was queued
+    deadline_seconds: float | None = None
+    status: str = "queued"      # queued -> running -> completed | failed
+    stages: dict = field(default_factory=dict)
+    result: dict | None = None
+    error: dict | None = None
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "repository": f"{self.owner}/{self.repo}",
+            "depth": self.depth,
+            "status": self.status,
+            "stages": dict(self.stages),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error
+        }
+
+
+class JobManager:
+    """
+    Runs analyses on a bounded worker pool and keeps their progress in
+    memory until they expire.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int, ttl_seconds: float):
+        self.max_pending = max_pending
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        repo_url: str,
+        owner: str,
+        repo: str,
+        depth: str = "standard",
+        deadline_seconds: float | None = None
+    ) -> AnalysisJob:
+        with self._lock:
+            self._purge_expired()
+
+            unfinished = sum(
+                1 for j in self._jobs.values() if j.status in ("queued", "running")
+            )
+            if unfinished >= self.max_pending:
+                raise JobQueueFull("Too many analyses in progress, retry later")
+
+            job = AnalysisJob(
+                id=uuid.uuid4().hex,
+                repo_url=repo_url,
+                owner=owner,
+                repo=repo,
+                depth=depth,
+                deadline_seconds=deadline_seconds
+            )
+            self._jobs[job.id] = job
+
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> AnalysisJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: AnalysisJob) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+
+        def on_stage(name, status, result):
+            job.stages[name] = status
+
+        try:
+            job.result = run_analysis(
+                job.repo_url, job.owner, job.repo,
+                on_stage=on_stage,
+                depth=job.depth,
+                deadline_seconds=job.deadline_seconds
+            )
+            job.status = "completed"
+        except AnalysisError as e:
+            job.error = {"status_code": e.status_code, "detail": e.detail}
+            job.status = "failed"
+        except Exception as e:
+            job.error = {"status_code": 500, "detail": f"Analysis failed: {e}"}
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+
+    def _purge_expired(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+job_manager = JobManager(ANALYSIS_JOB_WORKERS, ANALYSIS_JOB_MAX_PENDING, ANALYSIS_JOB_TTL_SECONDS)
@@ -0,0 +1,111 @@
+from concurrent.futures import Future, wait
+from typing import Any, Callable
+
+from backend.app.config import LLM_DEADLINE_SECONDS
+from backend.app.services.llm_client import submit
+from backend.app.services.ai_summary_service import generate_repo_summary, fallback_summary
+from backend.app.services.ai_roadmap_service import generate_dynamic_roadmap, fallback_roadmap
+from backend.app.services.ai_repo_explainer import (
+    generate_repo_explanation,
+    unavailable_explanation
+)
+from backend.app.utils.metrics import FALLBACKS
+
+
+def start_repo_explanation(repo: str, readme: str) -> Future:
+    # The explanation only needs the README, so it is started as soon as
+    # that is read and keeps running while the analyzers finish
+    return submit(generate_repo_explanation(repo, readme))
+
+
+def collect_with_deadline(
+    calls: dict[str, tuple[Future, Callable[[], Any]]],
+    timeout: float,
+    fallbacks: set[str] | None = None
+) -> dict[str, Any]:
+    """
+    Waits for every (future, fallback) pair under one shared deadline.
+    Calls that fail or are still running when it passes are cancelled and
+    replaced by their fallback, and their names added to fallbacks.
+    """
+    if fallbacks is None:
+        fallbacks = set()
+
+    wait([future for future, _ in calls.values()], timeout=timeout)
+
+    results = {}
+    for name, (future, fallback) in calls.items():
+        if not future.done():
+            future.cancel()
+            print(f"[LLM] '{name}' missed the {timeout}s deadline, using fallback")
+            FALLBACKS.labels(name).inc()
+            fallbacks.add(name)
+            results[name] = fallback()
+            continue
+
+        try:
+            results[name] = future.result()
+        except Exception as e:
+            print(f"[LLM] '{name}' failed, using fallback: {e}")
+            FALLBACKS.labels(name).inc()
+            fallbacks.add(name)
+            results[name] = fallback()
+
+    return results
+
+
+def run_llm_fanout(
+    repo: str,
+    explanation: Future,
+    score,
+    structure,
+    code,
+    doc,
+    testing,
+    git,
+    timeout: float = LLM_DEADLINE_SECONDS
+) -> dict[str, Any]:
+    """
+    Runs the summary and roadmap calls concurrently with the explanation
+    call already in flight. LLM wall time is the slowest call, capped at
+    timeout. "fallbacks" lists the calls replaced by their fallback.
+    """
+    summary = submit(generate_repo_summary(repo, score, structure, code, doc, testing, git))
+    roadmap = submit(generate_dynamic_roadmap(repo, score, structure, code, doc, testing, git))
+
+    calls = {
+        "project_overview": (explanation, unavailable_explanation),
+        "summary": (summary, lambda: fallback_summary(score, doc, testing, git)),
+        "roadmap": (
+            roadmap,
+            lambda: fallback_roadmap(score, structure, code, testing, doc, git)
+        )
+    }
+    # The services raise on failure, so every fallback is applied (and
+    # counted) by collect_with_deadline
+    fallbacks = set()
+    results = collect_with_deadline(calls, timeout, fallbacks)
+
+    return {**results, "fallbacks": sorted(fallbacks)}
+
+
+def fallback_results(score, structure, code, doc, testing, git) -> dict[str, Any]:
+    # Stands in for every LLM call when the llm stage is cut off (deadline
+    # or a missing analyzer), so the text fields are never left empty
+    return {
+        **rule_based_results(score, structure, code, doc, testing, git),
+        "project_overview": unavailable_explanation(),
+        "fallbacks": ["project_overview", "roadmap", "summary"]
+    }
+
+
+def rule_based_results(score, structure, code, doc, testing, git) -> dict[str, Any]:
+    # Quick analyses make no LLM calls: the summary and roadmap come from
+    # the same rules the fallbacks use, and there is no explanation.
+    # Analyzers that were skipped (None) are left out of the rules.
+    return {
+        "project_overview": None,
+        "summary": fallback_summary(score, doc, testing, git),
+        "roadmap": fallback_roadmap(score, structure, code, testing, doc, git),
+        "fallbacks": []
+    }
@@ -0,0 +1,133 @@
+import statistics
+import time
+from concurrent.futures import as_completed
+from datetime import datetime, timezone
+from typing import Iterator
+
+from backend.app.config import ORG_SCAN_MAX_REPOS
+from backend.app.core.batch import analyze_batch_item, get_batch_executor
+from backend.app.services.github_service import iter_account_repositories
+
+
+def select_repositories(
+    account: str,
+    language: str | None = None,
+    include_archived: bool = False,
+    include_forks: bool = False,
+    pushed_after: datetime | None = None,
+    max_repos: int = ORG_SCAN_MAX_REPOS
+) -> list[dict]:
+    if pushed_after and pushed_after.tzinfo is None:
+        pushed_after = pushed_after.replace(tzinfo=timezone.utc)
+
+    selected = []
+    for repo in iter_account_repositories(account, pushed_after):
+        if repo.get("archived") and not include_archived:
+            continue
+        if repo.get("fork") and not include_forks:
+            continue
+        if language and (repo.get("language") or "").lower() != language.lower():
+            continue
+
+        selected.append(repo)
+        if len(selected) >= max_repos:
+            break
+
+    return selected
+
+
+def listing_facts(repo: dict) -> dict:
+    return {
+        "language": repo.get("language"),
+        "stars": repo.get("stargazers_count"),
+        "forks": repo.get("forks_count"),
+        "archived": repo.get("archived"),
+        "pushed_at": repo.get("pushed_at")
+    }
+
+
+def repo_line(repo: dict, item: dict) -> dict:
+    """
+    One NDJSON record: the score breakdown plus the facts a reader needs
+    to compare repositories, without the full analysis payload.
+    """
+    line = {
+        "type": "result",
+        "repository": repo["full_name"],
+        "status": item["status"],
+        "duration_seconds": item["duration_seconds"],
+        "facts": listing_facts(repo)
+    }
+
+    if item["status"] != "completed":
+        line["error"] = item["error"]
+        return line
+
+    result = item["result"]
+    # Analyzers skipped at the request deadline are None
+    analysis = {name: value or {} for name, value in result["analysis"].items()}
+    line["cached"] = result.get("cached", False)
+    line["commit_sha"] = result.get("commit_sha")
+    line["score"] = result["score"]
+    line["facts"].update({
+        "total_commits": analysis["git_practices"].get("total_commits"),
+        "pylint_score": analysis["code_quality"].get("pylint_score"),
+        "average_complexity": analysis["code_quality"].get("average_complexity"),
+        "has_tests": analysis["testing"].get("has_tests"),
+        "has_ci": analysis["structure"].get("has_ci"),
+        "has_readme": analysis["documentation"].get("has_readme")
+    })
+    return line
+
+
+def summarize_org_scan(account: str, lines: list[dict], elapsed: float) -> dict:
+    completed = [l for l in lines if l["status"] == "completed"]
+    scores = [l["score"]["total_score"] for l in completed]
+
+    levels = {}
+    for l in completed:
+        levels[l["score"]["level"]] = levels.get(l["score"]["level"], 0) + 1
+
+    best = max(completed, key=lambda l: l["score"]["total_score"], default=None)
+    worst = min(completed, key=lambda l: l["score"]["total_score"], default=None)
+
+    return {
+        "type": "summary",
+        "account": account,
+        "total": len(lines),
+        "completed": len(completed),
+        "failed": len(lines) - len(completed),
+        "average_score": round(statistics.mean(scores), 1) if scores else None,
+        "median_score": statistics.median(scores) if scores else None,
+        "levels": levels,
+        "best": best and {"repository": best["repository"], "total_score": best["score"]["total_score"]},
+        "worst": worst and {"repository": worst["repository"], "total_score": worst["score"]["total_score"]},
+        "duration_seconds": round(elapsed, 3)
+    }
+
+
+def iter_org_scan(account: str, repos: list[dict]) -> Iterator[dict]:
+    """
+    Analyzes the repositories on the shared batch executor and yields a
+    record per repository as it finishes, then a summary record.
+    """
+    start = time.perf_counter()
+    yield {"type": "listing", "account": account, "repositories": len(repos)}
+
+    executor = get_batch_executor()
+    futures = {
+        executor.submit(analyze_batch_item, repo["html_url"], repo["owner"]["login"], repo["name"]): repo
+        for repo in repos
+    }
+
+    lines = []
+    try:
+        for future in as_completed(futures):
+            line = repo_line(futures[future], future.result())
+            lines.append(line)
+            yield line
+    finally:
+        for future in futures:
+            future.cancel()
+
+    yield summarize_org_scan(account, lines, time.perf_counter() - start)
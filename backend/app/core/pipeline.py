@@ -0,0 +1,157 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from backend.app.utils.deadline import DeadlineExceeded
+
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable[..., Any]
+    deps: tuple[str, ...] = ()
+    # Called with the exception when the stage fails; its return value is
+    # used as the stage result. Without a fallback a failure aborts the run.
+    fallback: Callable[[Exception], Any] | None = None
+
+
+class StageSkipped(Exception):
+    # Raised by a stage that cannot run, e.g. because a result it needs
+    # was skipped
+    pass
+
+
+class StageError(Exception):
+    def __init__(self, stage: str, error: Exception):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+def validate_stages(stages: list[Stage]) -> None:
+    names = {s.name for s in stages}
+    if len(names) != len(stages):
+        raise ValueError("Duplicate stage names in pipeline")
+
+    for stage in stages:
+        missing = [d for d in stage.deps if d not in names]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages {missing}")
+
+    # Kahn's algorithm, only to reject cycles up front
+    remaining = {s.name: set(s.deps) for s in stages}
+    while remaining:
+        ready = [n for n, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle between stages {sorted(remaining)}")
+        for n in ready:
+            del remaining[n]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def _timed_call(timings: dict, name: str, func: Callable[..., Any], kwargs: dict) -> Any:
+    start = time.perf_counter()
+    try:
+        return func(**kwargs)
+    finally:
+        timings[name] = time.perf_counter() - start
+
+
+def run_pipeline(
+    stages: list[Stage],
+    max_workers: int = 8,
+    on_stage: Callable[[str, str, Any], None] | None = None,
+    timings: dict[str, float] | None = None,
+    deadline: float | None = None,
+    grace: float = 0.0
+) -> dict[str, Any]:
+    """
+    Runs every stage as soon as all of its dependencies have finished.
+    Each stage function receives its dependencies' results as keyword
+    arguments named after the dependency stages.
+
+    on_stage(name, status, result) is called from the scheduling thread with
+    status "running", "completed", "fallback" or "failed". When given,
+    timings receives each stage's run time in seconds (excluding time
+    spent queued for a worker).
+
+    With a deadline (time.monotonic() value), stages still running grace
+    seconds after it are abandoned and fail with DeadlineExceeded, so the
+    run finishes in bounded time. Their threads are left to finish in the
+    background.
+    """
+    def notify(name, status, result=None):
+        if on_stage is None:
+            return
+        try:
+            on_stage(name, status, result)
+        except Exception as e:
+            print(f"[PIPELINE] on_stage callback failed for '{name}': {e}")
+
+    validate_stages(stages)
+
+    if timings is None:
+        timings = {}
+
+    results = {}
+    pending = {s.name: s for s in stages}
+    running = {}
+
+    def fail(stage, error):
+        # A fallback may re-raise errors it does not handle
+        if stage.fallback is not None:
+            try:
+                results[stage.name] = stage.fallback(error)
+            except Exception as e:
+                error = e
+            else:
+                print(f"[PIPELINE] stage '{stage.name}' failed, using fallback: {error}")
+                notify(stage.name, "fallback", results[stage.name])
+                return
+
+        notify(stage.name, "failed", error)
+        raise StageError(stage.name, error) from error
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stage")
+    try:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if all(d in results for d in stage.deps):
+                    kwargs = {d: results[d] for d in stage.deps}
+                    # Stages see the caller's context variables (e.g. the
+                    # request's Server-Timing collector)
+                    future = executor.submit(
+                        contextvars.copy_context().run,
+                        _timed_call, timings, name, stage.func, kwargs
+                    )
+                    running[future] = stage
+                    del pending[name]
+                    notify(name, "running")
+
+            timeout = None
+            if deadline is not None:
+                timeout = max(0.0, deadline - time.monotonic()) + grace
+
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                for future, stage in list(running.items()):
+                    del running[future]
+                    future.cancel()
+                    fail(stage, DeadlineExceeded(f"Stage '{stage.name}' ran past the deadline"))
+
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    results[stage.name] = future.result()
+                    notify(stage.name, "completed", results[stage.name])
+                except Exception as e:
+                    fail(stage, e)
+    finally:
+        # Don't block the caller on stages that are no longer needed
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results
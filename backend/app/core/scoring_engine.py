@@ -1,3 +1,25 @@
+# Points available per category; they add up to 100
+CATEGORY_MAX = {
+    "structure": 15,
+    "code_quality": 25,
+    "documentation": 15,
+    "testing": 15,
+    "git_practices": 15,
+    "maintainability": 15
+}
+
+
+def rescale(points: int, measured: int, maximum: int) -> int:
+    """
+    Scales the points earned on the criteria that were measured up to the
+    category maximum, so a quick analysis that skipped a criterion (e.g.
+    pylint) stays comparable to a full one.
+    """
+    if measured == maximum:
+        return min(points, maximum)
+    return min(round(points * maximum / measured), maximum)
+
+
 def score_structure(structure) -> int:
     score = 0
 
@@ -13,6 +35,11 @@ def score_structure(structure) -> int:
     return min(score, 15)
 
 
+def measured_code_quality(code) -> int:
+    # pylint contributes 10 points when it ran
+    return CATEGORY_MAX["code_quality"] - (10 if code.pylint_skipped else 0)
+
+
 def score_code_quality(code) -> int:
     score = 0
 
@@ -34,7 +61,7 @@ def score_code_quality(code) -> int:
     if not code.high_complexity_files:
         score += 5
 
-    return min(score, 25)
+    return rescale(score, measured_code_quality(code), CATEGORY_MAX["code_quality"])
 
 
 def score_documentation(doc) -> int:
@@ -89,37 +116,59 @@ def score_git_practices(git) -> int:
     return min(score, 15)
 
 
-def score_maintainability(code, doc, testing) -> int:
+def measured_maintainability(code, doc, testing) -> int:
+    return 5 * sum(1 for analysis in (code, doc, testing) if analysis is not None)
+
+
+def score_maintainability(code, doc, testing) -> int | None:
+    measured = measured_maintainability(code, doc, testing)
+    if not measured:
+        return None
+
     score = 0
 
-    if code.average_complexity <= 3:
+    if code is not None and code.average_complexity <= 3:
         score += 5
-    if doc.doc_to_code_ratio >= 0.1:
+    if doc is not None and doc.doc_to_code_ratio >= 0.1:
         score += 5
-    if testing.has_tests:
+    if testing is not None and testing.has_tests:
         score += 5
 
-    return min(score, 15)
+    return rescale(score, measured, CATEGORY_MAX["maintainability"])
 
 
 from backend.app.models.analysis_models import ScoreBreakdown
 
 def calculate_final_score(structure, code, doc, testing, git) -> ScoreBreakdown:
-    s_structure = score_structure(structure)
-    s_code = score_code_quality(code)
-    s_doc = score_documentation(doc)
-    s_test = score_testing(testing)
-    s_git = score_git_practices(git)
+    """
+    Analyses that are missing (None) leave their category unscored; the
+    total is scaled from the categories that were scored, so analyses of
+    different depths land on the same 0-100 scale.
+    """
+    s_structure = score_structure(structure) if structure is not None else None
+    s_code = score_code_quality(code) if code is not None else None
+    s_doc = score_documentation(doc) if doc is not None else None
+    s_test = score_testing(testing) if testing is not None else None
+    s_git = score_git_practices(git) if git is not None else None
     s_maintain = score_maintainability(code, doc, testing)
 
-    total = (
-        s_structure +
-        s_code +
-        s_doc +
-        s_test +
-        s_git +
-        s_maintain
-    )
+    categories = {
+        "structure": s_structure,
+        "code_quality": s_code,
+        "documentation": s_doc,
+        "testing": s_test,
+        "git_practices": s_git,
+        "maintainability": s_maintain
+    }
+    scored = {name: points for name, points in categories.items() if points is not None}
+    possible = sum(CATEGORY_MAX[name] for name in scored)
+    total = round(sum(scored.values()) * 100 / possible) if possible else 0
+
+    # Share of the 100 points whose criteria were actually measured
+    measured = sum(CATEGORY_MAX[name] for name in scored if name not in ("code_quality", "maintainability"))
+    if s_code is not None:
+        measured += measured_code_quality(code)
+    measured += measured_maintainability(code, doc, testing)
 
     if total >= 75:
         level = "Advanced"
@@ -140,5 +189,6 @@ def calculate_final_score(structure, code, doc, testing, git) -> ScoreBreakdown:
         maintainability=s_maintain,
         total_score=total,
         level=level,
-        badge=badge
+        badge=badge,
+        coverage=round(measured / 100, 2)
     )
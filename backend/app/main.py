@@ -1,5 +1,17 @@
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
 from backend.app.api.analyze import router as analyze_router
+from backend.app.api.repos import router as repos_router
+from backend.app.services.github_client import rate_limit_stats
+from backend.app.services.llm_cache import llm_cache_stats
+from backend.app.utils.metrics import (
+    GITHUB_RATE_LIMIT_REMAINING,
+    format_server_timing,
+    start_request_timings
+)
 
 app = FastAPI(
     title="RepoAI",
@@ -8,7 +20,37 @@ app = FastAPI(
 )
 
 app.include_router(analyze_router)
+app.include_router(repos_router)
+
+
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    # Stages record into this dict while the request runs; streamed
+    # responses send their headers before any stage has finished
+    timings = start_request_timings()
+    start = time.perf_counter()
+
+    response = await call_next(request)
+
+    timings["total"] = time.perf_counter() - start
+    response.headers["Server-Timing"] = format_server_timing(timings)
+    return response
 
 @app.get("/")
 def health_check():
     return {"status": "OK"}
+
+@app.get("/github/rate-limit")
+def github_rate_limit():
+    return rate_limit_stats()
+
+@app.get("/llm/cache")
+def llm_cache():
+    return llm_cache_stats()
+
+@app.get("/metrics")
+def metrics():
+    for resource, remaining in rate_limit_stats()["remaining"].items():
+        GITHUB_RATE_LIMIT_REMAINING.labels(resource).set(remaining)
+
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
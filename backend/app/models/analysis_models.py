@@ -12,12 +12,46 @@ class StructureAnalysis(BaseModel):
     max_depth: int
 
 
+class FunctionComplexity(BaseModel):
+    file: str
+    function: str
+    line: int
+    complexity: int
+    grade: str
+
+
+class EstimateInterval(BaseModel):
+    estimate: float
+    lower: float
+    upper: float
+
+
+class SamplingReport(BaseModel):
+    population_files: int
+    sample_files: int
+    strata: int
+    confidence: float
+    pylint_score: EstimateInterval | None
+    average_complexity: EstimateInterval | None
+
+
 class CodeQualityAnalysis(BaseModel):
     total_code_files: int
     total_lines_of_code: int
     average_complexity: float
-    high_complexity_files: list
+    high_complexity_files: list[FunctionComplexity]
     pylint_score: float | None
+    pylint_partial: bool = False
+    # Quick analyses do not run pylint; scoring leaves it out
+    pylint_skipped: bool = False
+    code_lines: int = 0
+    comment_lines: int = 0
+    blank_lines: int = 0
+    unused_imports: int = 0
+    # Every measured block, deep analyses only
+    complexity_detail: list[FunctionComplexity] | None = None
+    # Set when the scores are estimates from a sample of files
+    sampling: SamplingReport | None = None
 
 
 class DocumentationAnalysis(BaseModel):
@@ -28,6 +62,7 @@ class DocumentationAnalysis(BaseModel):
     has_contributing: bool
     has_license: bool
     doc_to_code_ratio: float
+    docstring_coverage: float = 0.0
 
 
 class TestingAnalysis(BaseModel):
@@ -36,6 +71,8 @@ class TestingAnalysis(BaseModel):
     test_files_count: int
     test_frameworks: list
     has_coverage: bool
+    test_functions_count: int = 0
+    test_classes_count: int = 0
 
 
 class GitPracticesAnalysis(BaseModel):
@@ -45,18 +82,23 @@ class GitPracticesAnalysis(BaseModel):
     has_multiple_branches: bool
     has_pull_requests: bool
     is_actively_maintained: bool
+    # Distinct commit authors, known when the local history was read
+    contributors: int | None = None
 
 
 class ScoreBreakdown(BaseModel):
-    structure: int
-    code_quality: int
-    documentation: int
-    testing: int
-    git_practices: int
-    maintainability: int
+    # None when the analysis behind a category is missing
+    structure: int | None
+    code_quality: int | None
+    documentation: int | None
+    testing: int | None
+    git_practices: int | None
+    maintainability: int | None
     total_score: int
     level: str
     badge: str
+    # Share of the scoring criteria that were measured (1.0 = all)
+    coverage: float = 1.0
 
 
 class RoadmapItem(BaseModel):
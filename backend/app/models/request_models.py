@@ -1,4 +1,29 @@
-from pydantic import BaseModel, HttpUrl
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field, HttpUrl
+
+# quick: manifest heuristics only, no pylint or LLM; standard: the full
+# analysis; deep: full linting, complexity detail and a longer git history
+AnalysisDepth = Literal["quick", "standard", "deep"]
+
 
 class RepoAnalyzeRequest(BaseModel):
     repo_url: HttpUrl
+    depth: AnalysisDepth = "standard"
+
+
+class BatchAnalyzeRequest(BaseModel):
+    # Plain strings: an invalid URL fails its own entry, not the batch
+    repo_urls: list[str]
+    stream: bool = False
+
+
+class OrgAnalyzeRequest(BaseModel):
+    account: str
+    language: str | None = None
+    include_archived: bool = False
+    include_forks: bool = False
+    pushed_after: datetime | None = None
+    # Capped at ORG_SCAN_MAX_REPOS; unset means the cap
+    max_repos: int | None = Field(None, ge=1)
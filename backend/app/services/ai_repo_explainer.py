@@ -1,7 +1,4 @@
-import os
-from groq import Groq
-
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+from backend.app.services.llm_client import chat_completion
 
 
 def build_repo_explanation_prompt(repo_name: str, readme_text: str) -> str:
@@ -56,7 +53,18 @@ import json
 
 from backend.app.utils.json_extractor import extract_json
 
-def generate_repo_explanation(repo_name: str, readme_text: str) -> dict:
+
+def unavailable_explanation() -> dict:
+    return {
+        "purpose": "Explanation unavailable.",
+        "problem": "Explanation unavailable.",
+        "components": [],
+        "workflow": [],
+        "use_case": "Explanation unavailable."
+    }
+
+
+async def generate_repo_explanation(repo_name: str, readme_text: str) -> dict:
     if not readme_text.strip():
         return {
             "purpose": "README is empty or missing.",
@@ -66,37 +74,19 @@ def generate_repo_explanation(repo_name: str, readme_text: str) -> dict:
             "use_case": "Not specified."
         }
 
-    try:
-        response = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You explain software systems clearly and respond ONLY with JSON."
-                },
-                {
-                    "role": "user",
-                    "content": build_repo_explanation_prompt(repo_name, readme_text)
-                }
-            ],
-            temperature=0.1
-        )
-
-        raw_text = response.choices[0].message.content
-
-        # 🔍 VERY IMPORTANT DEBUG
-        print("DEBUG RAW MODEL OUTPUT:\n", raw_text)
-
-        return extract_json(raw_text)
-
-    except Exception as e:
-        print("[REPO EXPLANATION FALLBACK]", e)
-        return {
-            "purpose": "Explanation unavailable.",
-            "problem": "Explanation unavailable.",
-            "components": [],
-            "workflow": [],
-            "use_case": "Explanation unavailable."
-        }
+    # Failures propagate: the LLM orchestrator substitutes
+    # unavailable_explanation and counts the fallback
+    raw_text = await chat_completion(
+        "You explain software systems clearly and respond ONLY with JSON.",
+        build_repo_explanation_prompt(repo_name, readme_text),
+        temperature=0.1,
+        validate=extract_json,
+        call="explanation"
+    )
+
+    # 🔍 VERY IMPORTANT DEBUG
+    print("DEBUG RAW MODEL OUTPUT:\n", raw_text)
+
+    return extract_json(raw_text)
 
     
\ No newline at end of file
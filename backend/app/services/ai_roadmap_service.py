@@ -1,16 +1,9 @@
-import os
 import json
-from groq import Groq
 from backend.app.models.analysis_models import (
     ImprovementRoadmap,
     RoadmapItem
 )
-
-# =========================================================
-# Initialize Groq Client
-# =========================================================
-
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+from backend.app.services.llm_client import chat_completion
 
 # =========================================================
 # Prompt Builder (RULE-DRIVEN & DYNAMIC)
@@ -83,7 +76,7 @@ Example:
 # Main Roadmap Generator
 # =========================================================
 
-def generate_dynamic_roadmap(
+async def generate_dynamic_roadmap(
     repo_name,
     score,
     structure,
@@ -93,6 +86,8 @@ def generate_dynamic_roadmap(
     git
 ) -> ImprovementRoadmap:
 
+    # Failures (including unparseable answers) propagate: the LLM
+    # orchestrator substitutes fallback_roadmap and counts the fallback
     prompt = build_roadmap_prompt(
         repo_name,
         score,
@@ -103,53 +98,42 @@ def generate_dynamic_roadmap(
         git
     )
 
-    try:
-        response = client.chat.completions.create(
-            model="llama-3.1-8b-instant",  # HIGH reasoning model
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a strict senior software engineer who follows rules exactly."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.2
-        )
+    response = await chat_completion(
+        "You are a strict senior software engineer who follows rules exactly.",
+        prompt,
+        temperature=0.2,
+        validate=lambda text: json.loads(text.strip()),
+        call="roadmap"
+    )
 
-        raw_text = response.choices[0].message.content.strip()
+    raw_text = response.strip()
 
-        # 🔥 CRITICAL FIX: Use json.loads(), not eval()
-        raw_items = json.loads(raw_text)
+    # 🔥 CRITICAL FIX: Use json.loads(), not eval()
+    raw_items = json.loads(raw_text)
 
-        items = []
-        for item in raw_items:
-            items.append(
-                RoadmapItem(
-                    priority=item["priority"],
-                    category=item["category"],
-                    action=item["action"],
-                    expected_impact=item["expected_impact"]
-                )
+    items = []
+    for item in raw_items:
+        items.append(
+            RoadmapItem(
+                priority=item["priority"],
+                category=item["category"],
+                action=item["action"],
+                expected_impact=item["expected_impact"]
             )
+        )
 
-        return ImprovementRoadmap(items=items)
-
-    except Exception as e:
-        print("[ROADMAP GENERATION FAILED - FALLBACK USED]", e)
-        return fallback_roadmap(score, structure, code, testing, doc, git)
+    return ImprovementRoadmap(items=items)
 
 # =========================================================
 # Intelligent Fallback (Repo-Aware)
 # =========================================================
 
 def fallback_roadmap(score, structure, code, testing, doc, git) -> ImprovementRoadmap:
+    # Analyzers that were skipped (None) contribute no item
     items = []
     priority = 1
 
-    if not testing.has_tests:
+    if testing is not None and not testing.has_tests:
         items.append(RoadmapItem(
             priority=priority,
             category="Testing",
@@ -158,7 +142,7 @@ def fallback_roadmap(score, structure, code, testing, doc, git) -> ImprovementRo
         ))
         priority += 1
 
-    if code.average_complexity and code.average_complexity > 10:
+    if code is not None and code.average_complexity and code.average_complexity > 10:
         items.append(RoadmapItem(
             priority=priority,
             category="Code Quality",
@@ -167,7 +151,7 @@ def fallback_roadmap(score, structure, code, testing, doc, git) -> ImprovementRo
         ))
         priority += 1
 
-    if not structure.has_ci:
+    if structure is not None and not structure.has_ci:
         items.append(RoadmapItem(
             priority=priority,
             category="CI/CD",
@@ -176,7 +160,7 @@ def fallback_roadmap(score, structure, code, testing, doc, git) -> ImprovementRo
         ))
         priority += 1
 
-    if doc.has_readme and not (doc.has_installation and doc.has_usage):
+    if doc is not None and doc.has_readme and not (doc.has_installation and doc.has_usage):
         items.append(RoadmapItem(
             priority=priority,
             category="Documentation",
@@ -185,7 +169,7 @@ def fallback_roadmap(score, structure, code, testing, doc, git) -> ImprovementRo
         ))
         priority += 1
 
-    if git.commit_message_quality == "poor":
+    if git is not None and git.commit_message_quality == "poor":
         items.append(RoadmapItem(
             priority=priority,
             category="Git Practices",
@@ -0,0 +1,288 @@
+import os
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: in-process locking only
+    fcntl = None
+
+from backend.app.config import (
+    CLONE_STORE_DIR,
+    CLONE_STORE_MAX_BYTES,
+    CLONE_STORE_MIN_IDLE_SECONDS,
+    CLONE_WORKERS,
+    GIT_HISTORY_DEPTH
+)
+from backend.app.utils.deadline import DeadlineExceeded, time_left
+
+MIRRORS_DIR = os.path.join(CLONE_STORE_DIR, "mirrors")
+WORKTREES_DIR = os.path.join(CLONE_STORE_DIR, "worktrees")
+LOCKS_DIR = os.path.join(CLONE_STORE_DIR, "locks")
+
+# Ref the analyzed HEAD is fetched into inside each mirror
+HEAD_REF = "refs/repoai/head"
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+_evict_lock = threading.Lock()
+
+# Git never prompts for credentials: private or missing repositories fail
+# at once instead of waiting on a terminal nobody reads
+GIT_ENV = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+
+# Network fetches share a fixed number of slots, however many analyses run
+_fetch_slots = threading.BoundedSemaphore(CLONE_WORKERS)
+
+
+def store_key(owner: str, repo: str) -> str:
+    return f"{owner.lower()}__{repo.lower()}"
+
+
+def mirror_path(key: str) -> str:
+    return os.path.join(MIRRORS_DIR, f"{key}.git")
+
+
+def history_mirror_path(key: str) -> str:
+    return os.path.join(MIRRORS_DIR, f"{key}.history.git")
+
+
+def worktree_path(key: str, sha: str) -> str:
+    return os.path.join(WORKTREES_DIR, key, sha)
+
+
+def run_git(*args: str, cwd: str | None = None) -> str:
+    # Bounded by the request deadline; subprocess.run kills git on timeout
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=time_left(),
+            env=GIT_ENV
+        )
+    except subprocess.TimeoutExpired as e:
+        raise DeadlineExceeded(f"git {' '.join(args[:3])} ran past the request deadline") from e
+    return result.stdout.strip()
+
+
+@contextmanager
+def repo_lock(key: str, blocking: bool = True):
+    """
+    Serializes work on one repository across threads and, where fcntl is
+    available, across uvicorn worker processes. Yields False when
+    blocking=False and the lock is taken.
+    """
+    with _thread_locks_guard:
+        lock = _thread_locks.setdefault(key, threading.Lock())
+
+    if not lock.acquire(blocking=blocking):
+        yield False
+        return
+
+    try:
+        if fcntl is None:
+            yield True
+            return
+
+        os.makedirs(LOCKS_DIR, exist_ok=True)
+        with open(os.path.join(LOCKS_DIR, f"{key}.lock"), "w") as lock_file:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.flock(lock_file, flags)
+            except BlockingIOError:
+                yield False
+                return
+
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    finally:
+        lock.release()
+
+
+def has_commit(mirror: str, sha: str) -> bool:
+    try:
+        run_git("--git-dir", mirror, "cat-file", "-e", f"{sha}^{{commit}}")
+        return True
+    except subprocess.CalledProcessError:
+        return False
+
+
+def update_mirror(repo_url: str, key: str, sha: str | None) -> str:
+    """
+    Makes sure the bare mirror contains the remote HEAD commit and returns
+    its SHA. Known commits need no network access; otherwise a shallow
+    incremental fetch only transfers objects the mirror doesn't have.
+    """
+    mirror = mirror_path(key)
+
+    if not os.path.isdir(mirror):
+        os.makedirs(MIRRORS_DIR, exist_ok=True)
+        run_git("init", "--bare", "--quiet", mirror)
+
+    if sha and has_commit(mirror, sha):
+        return sha
+
+    with _fetch_slots:
+        run_git(
+            "--git-dir", mirror,
+            "fetch", "--quiet", "--depth", "1", "--no-tags",
+            repo_url, f"+HEAD:{HEAD_REF}"
+        )
+    return run_git("--git-dir", mirror, "rev-parse", HEAD_REF)
+
+
+def update_history_mirror(
+    repo_url: str,
+    owner: str,
+    repo: str,
+    depth: int = GIT_HISTORY_DEPTH
+) -> str:
+    """
+    Keeps a treeless (commits only, no files) mirror of the last depth
+    commits of HEAD and returns its path. It is separate
+    from the checkout mirror so the shallow checkout fetches never cut its
+    history short; repeat fetches only transfer new commits.
+    """
+    key = store_key(owner, repo)
+    mirror = history_mirror_path(key)
+
+    with repo_lock(f"{key}.history"):
+        if not os.path.isdir(mirror):
+            os.makedirs(MIRRORS_DIR, exist_ok=True)
+            run_git("init", "--bare", "--quiet", mirror)
+
+        with _fetch_slots:
+            run_git(
+                "--git-dir", mirror,
+                "fetch", "--quiet", "--no-tags",
+                "--filter=tree:0", "--depth", str(depth),
+                repo_url, f"+HEAD:{HEAD_REF}"
+            )
+        touch(mirror)
+
+    evict_to_budget()
+    return mirror
+
+
+def checkout_worktree(key: str, sha: str) -> str:
+    path = worktree_path(key, sha)
+
+    if not os.path.isdir(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Worktrees are immutable per commit, so concurrent analyses of the
+        # same SHA can share one checkout
+        run_git(
+            "--git-dir", mirror_path(key),
+            "worktree", "add", "--quiet", "--detach", "--force", path, sha
+        )
+
+    touch(path)
+    return path
+
+
+def touch(path: str) -> None:
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def checkout_repository(repo_url: str, owner: str, repo: str, sha: str | None = None) -> str:
+    """
+    Returns a checkout of the repository's HEAD (or of sha, when known)
+    from the local mirror store.
+    """
+    key = store_key(owner, repo)
+
+    with repo_lock(key):
+        sha = update_mirror(repo_url, key, sha)
+        path = checkout_worktree(key, sha)
+        touch(mirror_path(key))
+
+    evict_to_budget()
+    return path
+
+
+def dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for f in files:
+            try:
+                total += os.lstat(os.path.join(root, f)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def evict_to_budget() -> None:
+    """
+    Deletes the least recently used worktrees, then mirrors, until the
+    store fits CLONE_STORE_MAX_BYTES. Anything used within the idle grace
+    period or locked by another request is left alone.
+    """
+    if not _evict_lock.acquire(blocking=False):
+        return
+
+    try:
+        candidates = []  # (last_used, size, kind, key, path)
+        total = 0
+
+        if os.path.isdir(MIRRORS_DIR):
+            for name in os.listdir(MIRRORS_DIR):
+                path = os.path.join(MIRRORS_DIR, name)
+                size = dir_size(path)
+                total += size
+                candidates.append((os.path.getmtime(path), size, "mirror", name[:-len(".git")], path))
+
+        if os.path.isdir(WORKTREES_DIR):
+            for key in os.listdir(WORKTREES_DIR):
+                for sha in os.listdir(os.path.join(WORKTREES_DIR, key)):
+                    path = worktree_path(key, sha)
+                    size = dir_size(path)
+                    total += size
+                    candidates.append((os.path.getmtime(path), size, "worktree", key, path))
+
+        if total <= CLONE_STORE_MAX_BYTES:
+            return
+
+        cutoff = time.time() - CLONE_STORE_MIN_IDLE_SECONDS
+        # Oldest first; on ties worktrees go before the mirror they belong to
+        candidates.sort(key=lambda c: (c[0], c[2] == "mirror"))
+
+        for last_used, size, kind, key, path in candidates:
+            if total <= CLONE_STORE_MAX_BYTES:
+                break
+            if last_used > cutoff or not os.path.exists(path):
+                continue
+
+            with repo_lock(key, blocking=False) as acquired:
+                if not acquired:
+                    continue
+
+                if kind == "worktree":
+                    shutil.rmtree(path, ignore_errors=True)
+                    try:
+                        run_git("--git-dir", mirror_path(key), "worktree", "prune")
+                    except (subprocess.CalledProcessError, OSError):
+                        pass
+                else:
+                    freed = size
+                    worktrees = os.path.join(WORKTREES_DIR, key)
+                    if os.path.isdir(worktrees):
+                        freed += dir_size(worktrees)
+                        shutil.rmtree(worktrees, ignore_errors=True)
+                    shutil.rmtree(path, ignore_errors=True)
+                    size = freed
+
+            print(f"[CLONE STORE] evicted {kind} {path}")
+            total -= size
+    finally:
+        _evict_lock.release()
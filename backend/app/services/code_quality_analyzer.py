@@ -1,84 +1,78 @@
-import os
-import subprocess
+from backend.app.config import PYLINT_SHARD_TIMEOUT_SECONDS
 from backend.app.models.analysis_models import CodeQualityAnalysis
-
-
-def collect_python_files(repo_path: str) -> list[str]:
-    py_files = []
-    for root, dirs, files in os.walk(repo_path):
-        if ".git" in root or "__pycache__" in root:
-            continue
-        for file in files:
-            if file.endswith(".py"):
-                py_files.append(os.path.join(root, file))
-    return py_files
-
-
-def count_loc(files: list[str]) -> int:
-    total = 0
-    for f in files:
-        try:
-            with open(f, "r", encoding="utf-8", errors="ignore") as file:
-                total += sum(1 for _ in file)
-        except Exception:
-            pass
-    return total
-
-
-import re
-
-def run_radon(repo_path: str) -> tuple[float, list]:
-    result = subprocess.run(
-        ["radon", "cc", repo_path, "-a", "-s"],
-        capture_output=True,
-        text=True
-    )
-
-    avg_complexity = 0.0
-    high_risk = []
-
-    for line in result.stdout.splitlines():
-
-        # Extract numeric complexity safely
-        if "Average complexity" in line:
-            match = re.search(r"\(([\d\.]+)\)", line)
-            if match:
-                avg_complexity = float(match.group(1))
-
-        # Detect risky files (D, E, F)
-        if any(f"({grade})" in line for grade in ["D", "E", "F"]):
-            high_risk.append(line)
-
-    return avg_complexity, high_risk
-
-
-def run_pylint(files: list[str]) -> float | None:
-    if not files:
-        return None
-
-    result = subprocess.run(
-        ["pylint", *files, "--score=y"],
-        capture_output=True,
-        text=True
-    )
-
-    for line in result.stdout.splitlines():
-        if "Your code has been rated at" in line:
-            return float(line.split("/")[0].split()[-1])
-
-    return None
-
-
-def analyze_code_quality(repo_path: str) -> CodeQualityAnalysis:
-    py_files = collect_python_files(repo_path)
-    loc = count_loc(py_files)
-    avg_complexity, risky = run_radon(repo_path)
-    pylint_score = run_pylint(py_files)
+from backend.app.services.repo_scanner import RepoManifest
+from backend.app.services.complexity_engine import (
+    to_function_complexity,
+    average_complexity,
+    high_complexity_blocks
+)
+from backend.app.services.lint_engine import run_sharded_pylint
+from backend.app.services.sampling import (
+    estimate_complexity,
+    estimate_pylint_score,
+    sampling_report
+)
+from backend.app.services.source_index import SourceIndex
+from backend.app.utils.deadline import deadline_expired
+from backend.app.utils.metrics import timed_stage
+
+
+def analyze_code_quality(
+    manifest: RepoManifest,
+    index: SourceIndex,
+    lint: bool = True,
+    lint_timeout: float = PYLINT_SHARD_TIMEOUT_SECONDS,
+    detail: bool = False
+) -> CodeQualityAnalysis:
+    # Line counts and complexity come from the shared index; only pylint
+    # still parses the files itself, in its own processes
+    py_files = index.paths
+    plan = index.sample
+    lint_files = plan.paths if plan else py_files
+    complexity = to_function_complexity(index.complexity_rows())
+    mean_complexity = average_complexity(complexity)
+
+    pylint_score = None
+    pylint_partial = False
+    pylint_skipped = not lint
+    penalties = {}
+    if lint:
+        with manifest.materialize(lint_files) as lint_root, timed_stage("pylint"):
+            result = run_sharded_pylint(lint_root, lint_files, lint_timeout)
+        pylint_score = result.score
+        pylint_partial = result.partial
+        penalties = result.file_penalties
+        # No shard finished before the request deadline: not measured,
+        # rather than a zero score
+        pylint_skipped = result.score is None and result.partial and deadline_expired()
+
+    # Sampled repositories report estimates for the whole tree instead of
+    # the figures of the sample itself
+    sampling = None
+    if plan:
+        complexity_estimate = estimate_complexity(plan, index.complexity_rows())
+        pylint_estimate = estimate_pylint_score(
+            plan, penalties, {path: f.statements for path, f in index.files.items()}
+        ) if lint else None
+
+        sampling = sampling_report(plan, complexity_estimate, pylint_estimate)
+        mean_complexity = complexity_estimate.estimate if complexity_estimate else 0.0
+        pylint_score = pylint_estimate.estimate if pylint_estimate else None
 
     return CodeQualityAnalysis(
         total_code_files=len(py_files),
-        total_lines_of_code=loc,
-        average_complexity=avg_complexity,
-        high_complexity_files=risky,
-        pylint_score=pylint_score
+        total_lines_of_code=index.total("total_lines"),
+        average_complexity=mean_complexity,
+        high_complexity_files=high_complexity_blocks(complexity),
+        pylint_score=pylint_score,
+        pylint_partial=pylint_partial,
+        pylint_skipped=pylint_skipped,
+        code_lines=index.total("code_lines"),
+        comment_lines=index.total("comment_lines"),
+        blank_lines=index.total("blank_lines"),
+        unused_imports=sum(len(f.unused_imports) for f in index.files.values()),
+        complexity_detail=(
+            sorted(complexity, key=lambda r: r.complexity, reverse=True) if detail else None
+        ),
+        sampling=sampling
     )
@@ -0,0 +1,114 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable
+
+from radon.complexity import cc_visit_ast, cc_rank
+
+from backend.app.config import COMPLEXITY_WORKERS, COMPLEXITY_INLINE_MAX_FILES
+from backend.app.models.analysis_models import FunctionComplexity
+from backend.app.utils.deadline import DeadlineExceeded, time_left
+
+HIGH_RISK_GRADES = {"D", "E", "F"}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Process pool shared by every analysis in this worker. "spawn" avoids
+    forking a process that already runs server and pipeline threads.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=COMPLEXITY_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def reset_process_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def analyze_tree_complexity(rel_path: str, tree) -> list[tuple]:
+    # Plain tuples keep the results cheap to send back from worker processes
+    try:
+        blocks = cc_visit_ast(tree)
+    except Exception:
+        return []
+
+    return [
+        (rel_path, block.fullname, block.lineno, block.complexity)
+        for block in blocks
+    ]
+
+
+def split_batches(items: list[tuple], batch_count: int) -> list[list]:
+    # Round-robin over size-sorted files so every batch gets a mix of big and
+    # small modules
+    ordered = sorted(items, key=lambda s: len(s[1]), reverse=True)
+    batches = [ordered[i::batch_count] for i in range(batch_count)]
+    return [b for b in batches if b]
+
+
+def map_source_batches(func: Callable[[list], list], sources: list[tuple]) -> list:
+    """
+    Applies func to batches of (relative path, source, ...) tuples across CPU
+    cores and concatenates the results. Small inputs run inline, where
+    process start-up would cost more than it saves.
+    """
+    if len(sources) <= COMPLEXITY_INLINE_MAX_FILES:
+        return func(sources)
+
+    # A few batches per core balances load without per-file IPC overhead
+    batches = split_batches(sources, COMPLEXITY_WORKERS * 4)
+    futures = [get_process_pool().submit(func, batch) for batch in batches]
+    results = []
+    try:
+        for future in futures:
+            results.extend(future.result(timeout=time_left()))
+    except BrokenProcessPool as e:
+        print("[COMPLEXITY] process pool failed, analyzing inline:", e)
+        reset_process_pool()
+        results = func(sources)
+    except (TimeoutError, DeadlineExceeded) as e:
+        # The pool is shared, so only this request's queued batches are
+        # dropped; batches already running finish in their workers
+        for future in futures:
+            future.cancel()
+        raise DeadlineExceeded("Source indexing ran past the request deadline") from e
+
+    return results
+
+
+def to_function_complexity(rows: list[tuple]) -> list[FunctionComplexity]:
+    return [
+        FunctionComplexity(
+            file=file,
+            function=function,
+            line=line,
+            complexity=complexity,
+            grade=cc_rank(complexity)
+        )
+        for file, function, line, complexity in rows
+    ]
+
+
+def average_complexity(results: list[FunctionComplexity]) -> float:
+    if not results:
+        return 0.0
+    return round(sum(r.complexity for r in results) / len(results), 2)
+
+
+def high_complexity_blocks(results: list[FunctionComplexity]) -> list[FunctionComplexity]:
+    risky = [r for r in results if r.grade in HIGH_RISK_GRADES]
+    return sorted(risky, key=lambda r: r.complexity, reverse=True)
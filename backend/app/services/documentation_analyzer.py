@@ -1,21 +1,14 @@
-import os
 from backend.app.models.analysis_models import DocumentationAnalysis
+from backend.app.services.repo_scanner import RepoManifest
+from backend.app.services.source_index import SourceIndex
 
-def find_readme(repo_path: str) -> str | None:
-    for file in os.listdir(repo_path):
-        if file.lower().startswith("readme"):
-            return os.path.join(repo_path, file)
+def find_readme(manifest: RepoManifest) -> str | None:
+    for entry in manifest.root_entries():
+        if not entry.is_dir and entry.name.lower().startswith("readme"):
+            return entry.path
     return None
 
 
-def read_file_safe(path: str) -> str:
-    try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            return f.read()
-    except Exception:
-        return ""
-
-
 def detect_sections(text: str) -> dict:
     text_lower = text.lower()
 
@@ -37,8 +30,9 @@ def calculate_doc_ratio(readme_lines: int, loc: int) -> float:
     return round(readme_lines / loc, 3)
 
 
-def analyze_documentation(repo_path: str, total_loc: int) -> DocumentationAnalysis:
-    readme_path = find_readme(repo_path)
+def analyze_documentation(manifest: RepoManifest, index: SourceIndex) -> DocumentationAnalysis:
+    readme_path = find_readme(manifest)
+    docstring_coverage = index.docstring_coverage()
 
     if not readme_path:
         return DocumentationAnalysis(
@@ -48,10 +42,11 @@ def analyze_documentation(repo_path: str, total_loc: int) -> DocumentationAnalys
             has_usage=False,
             has_contributing=False,
             has_license=False,
-            doc_to_code_ratio=0.0
+            doc_to_code_ratio=0.0,
+            docstring_coverage=docstring_coverage
         )
 
-    content = read_file_safe(readme_path)
+    content = manifest.read_text(readme_path)
     sections = detect_sections(content)
     readme_lines = count_lines(content)
 
@@ -62,19 +57,17 @@ def analyze_documentation(repo_path: str, total_loc: int) -> DocumentationAnalys
         has_usage=sections["usage"],
         has_contributing=sections["contributing"],
         has_license=sections["license"],
-        doc_to_code_ratio=calculate_doc_ratio(readme_lines, total_loc)
+        doc_to_code_ratio=calculate_doc_ratio(readme_lines, index.total("total_lines")),
+        docstring_coverage=docstring_coverage
     )
 
 
-def get_readme_content(repo_path: str) -> str:
-    for root, _, files in os.walk(repo_path):
-        for file in files:
-            if file.lower() == "readme.md":
-                path = os.path.join(root, file)
-                with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-                    print("DEBUG: README FOUND AT", path)
-                    print("DEBUG: README LENGTH", len(content))
-                    return content
+def get_readme_content(manifest: RepoManifest) -> str:
+    for entry in manifest.files:
+        if entry.name.lower() == "readme.md":
+            content = manifest.read_text(entry.path)
+            print("DEBUG: README FOUND AT", entry.path)
+            print("DEBUG: README LENGTH", len(content))
+            return content
     print("DEBUG: README NOT FOUND")
     return ""
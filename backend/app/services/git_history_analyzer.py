@@ -0,0 +1,139 @@
+import subprocess
+from typing import Iterator
+
+from backend.app.config import GIT_HISTORY_DEPTH
+from backend.app.models.analysis_models import GitPracticesAnalysis
+from backend.app.services.clone_store import GIT_ENV, HEAD_REF, update_history_mirror
+from backend.app.services.git_practices_analyzer import build_git_practices
+from backend.app.utils.deadline import abort_at_deadline
+
+# Commits are separated by \x1e and their fields by \x1f, which never occur
+# in commit messages
+LOG_FORMAT = "%H%x1f%aI%x1f%aE%x1f%B%x1e"
+
+# evaluate_commit_messages only samples the most recent commits
+MESSAGE_SAMPLE = 10
+
+
+def iter_git_log(git_dir: str, ref: str = HEAD_REF, max_count: int | None = None) -> Iterator[dict]:
+    """
+    Streams `git log` and yields one commit at a time, shaped like the
+    GitHub REST commit objects, without buffering the whole history.
+    """
+    # The mirror may hold more history than asked for when a deeper
+    # analysis fetched it
+    limit = [f"--max-count={max_count}"] if max_count else []
+    process = subprocess.Popen(
+        ["git", "--git-dir", git_dir, "log", f"--format={LOG_FORMAT}", *limit, ref],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        encoding="utf-8",
+        errors="ignore"
+    )
+
+    # A killed git log must not pass for a short history: abort_at_deadline
+    # raises when it killed git, and git is only killed here when the
+    # caller stopped reading early, so a complete read requires exit code 0
+    completed = False
+    try:
+        with abort_at_deadline(process.kill):
+            buffer = ""
+            for chunk in iter(lambda: process.stdout.read(65536), ""):
+                buffer += chunk
+                *records, buffer = buffer.split("\x1e")
+                for record in records:
+                    commit = parse_log_record(record)
+                    if commit:
+                        yield commit
+
+            commit = parse_log_record(buffer)
+            if commit:
+                yield commit
+        completed = True
+    finally:
+        process.stdout.close()
+        if not completed and process.poll() is None:
+            process.kill()
+        process.wait()
+
+    if process.returncode != 0:
+        raise Exception(f"git log failed with exit code {process.returncode}")
+
+
+def parse_log_record(record: str) -> dict | None:
+    record = record.strip("\n")
+    if not record:
+        return None
+
+    sha, date, email, message = record.split("\x1f", 3)
+    return {
+        "sha": sha,
+        "commit": {"message": message.strip(), "author": {"date": date, "email": email}}
+    }
+
+
+def count_remote_refs(repo_url: str, pattern: str, limit: int) -> int:
+    """
+    Counts refs matching pattern on the remote, reading at most limit
+    lines (repos can have tens of thousands of pull request refs).
+    """
+    process = subprocess.Popen(
+        ["git", "ls-remote", repo_url, pattern],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        env=GIT_ENV
+    )
+
+    count = 0
+    stopped_early = False
+    try:
+        with abort_at_deadline(process.kill):
+            for line in process.stdout:
+                if line.strip():
+                    count += 1
+                if count >= limit:
+                    stopped_early = True
+                    break
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+    # Auth failures, network errors and rate limits would otherwise look
+    # like a repository without branches or pull requests
+    if process.returncode != 0 and not stopped_early:
+        raise Exception(f"git ls-remote failed with exit code {process.returncode}")
+
+    return count
+
+
+def analyze_git_history(
+    repo_url: str,
+    owner: str,
+    repo: str,
+    depth: int = GIT_HISTORY_DEPTH
+) -> GitPracticesAnalysis:
+    """
+    Git practice metrics from a local, treeless history mirror instead of
+    the GitHub API: the commit and contributor counts cover up to depth
+    commits rather than one API page.
+    """
+    git_dir = update_history_mirror(repo_url, owner, repo, depth)
+
+    recent = []
+    authors = set()
+    total = 0
+    for commit in iter_git_log(git_dir, max_count=depth):
+        if total < MESSAGE_SAMPLE:
+            recent.append(commit)
+        authors.add(commit["commit"]["author"]["email"].lower())
+        total += 1
+
+    # GitHub exposes every pull request as refs/pull/<n>/head
+    branches = count_remote_refs(repo_url, "refs/heads/*", limit=2) > 1
+    prs = count_remote_refs(repo_url, "refs/pull/*/head", limit=1) > 0
+
+    return build_git_practices(recent, total, branches, prs, contributors=len(authors))
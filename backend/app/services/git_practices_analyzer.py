@@ -1,19 +1,9 @@
-import requests
 from datetime import datetime, timezone
-from backend.app.config import GITHUB_API_BASE, GITHUB_TOKEN
+from backend.app.services.github_client import github_get
 from backend.app.models.analysis_models import GitPracticesAnalysis
 
-
-HEADERS = {
-    "Accept": "application/vnd.github+json"
-}
-
-if GITHUB_TOKEN:
-    HEADERS["Authorization"] = f"Bearer {GITHUB_TOKEN}"
-
 def fetch_commits(owner: str, repo: str) -> list:
-    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/commits"
-    response = requests.get(url, headers=HEADERS)
+    response = github_get(f"/repos/{owner}/{repo}/commits")
 
     if response.status_code != 200:
         return []
@@ -25,7 +15,9 @@ def calculate_recent_activity(commits: list) -> int | None:
     if not commits:
         return None
 
-    latest_date_str = commits[0]["commit"]["author"]["date"]
+    latest_date_str = (commits[0]["commit"].get("author") or {}).get("date")
+    if not latest_date_str:
+        return None
     latest_date = datetime.fromisoformat(latest_date_str.replace("Z", "+00:00"))
     now = datetime.now(timezone.utc)
 
@@ -52,8 +44,7 @@ def evaluate_commit_messages(commits: list) -> str:
 
 
 def has_multiple_branches(owner: str, repo: str) -> bool:
-    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/branches"
-    response = requests.get(url, headers=HEADERS)
+    response = github_get(f"/repos/{owner}/{repo}/branches")
 
     if response.status_code != 200:
         return False
@@ -63,8 +54,7 @@ def has_multiple_branches(owner: str, repo: str) -> bool:
 
 
 def has_pull_requests(owner: str, repo: str) -> bool:
-    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls?state=all"
-    response = requests.get(url, headers=HEADERS)
+    response = github_get(f"/repos/{owner}/{repo}/pulls", params={"state": "all"})
 
     if response.status_code != 200:
         return False
@@ -73,22 +63,44 @@ def has_pull_requests(owner: str, repo: str) -> bool:
     return len(prs) > 0
 
 
-def analyze_git_practices(owner: str, repo: str) -> GitPracticesAnalysis:
-    commits = fetch_commits(owner, repo)
-
+def build_git_practices(
+    commits: list,
+    total_commits: int,
+    branches: bool,
+    prs: bool,
+    contributors: int | None = None
+) -> GitPracticesAnalysis:
     recent_days = calculate_recent_activity(commits)
     commit_quality = evaluate_commit_messages(commits)
 
-    branches = has_multiple_branches(owner, repo)
-    prs = has_pull_requests(owner, repo)
-
     is_active = recent_days is not None and recent_days <= 180
 
     return GitPracticesAnalysis(
-        total_commits=len(commits),
+        total_commits=total_commits,
         recent_activity_days=recent_days,
         commit_message_quality=commit_quality,
         has_multiple_branches=branches,
         has_pull_requests=prs,
-        is_actively_maintained=is_active
+        is_actively_maintained=is_active,
+        contributors=contributors
+    )
+
+
+def git_practices_from_facts(facts: dict) -> GitPracticesAnalysis:
+    return build_git_practices(
+        facts["commits"],
+        facts["total_commits"],
+        facts["has_multiple_branches"],
+        facts["has_pull_requests"]
+    )
+
+
+def analyze_git_practices(owner: str, repo: str) -> GitPracticesAnalysis:
+    commits = fetch_commits(owner, repo)
+
+    return build_git_practices(
+        commits,
+        len(commits),
+        has_multiple_branches(owner, repo),
+        has_pull_requests(owner, repo)
     )
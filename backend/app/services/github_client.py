@@ -0,0 +1,207 @@
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from backend.app.config import (
+    GITHUB_API_BASE,
+    GITHUB_TOKENS,
+    GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS,
+    GITHUB_POOL_SIZE,
+    GITHUB_RETRIES,
+    GITHUB_CONNECT_TIMEOUT_SECONDS,
+    GITHUB_READ_TIMEOUT_SECONDS,
+    GITHUB_ETAG_CACHE_SIZE
+)
+from backend.app.services.github_token_pool import TokenPool
+from backend.app.utils.deadline import time_left
+from backend.app.utils.metrics import (
+    CACHE_EVENTS,
+    GITHUB_CALL_SECONDS,
+    GITHUB_ERRORS,
+    github_endpoint
+)
+
+HEADERS = {
+    "Accept": "application/vnd.github+json",
+    "X-GitHub-Api-Version": "2022-11-28"
+}
+
+TIMEOUT = (GITHUB_CONNECT_TIMEOUT_SECONDS, GITHUB_READ_TIMEOUT_SECONDS)
+
+
+def build_session() -> requests.Session:
+    retry = Retry(
+        total=GITHUB_RETRIES,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=GITHUB_POOL_SIZE,
+        max_retries=retry
+    )
+
+    pooled = requests.Session()
+    pooled.mount("https://", adapter)
+    pooled.mount("http://", adapter)
+    pooled.headers.update(HEADERS)
+    return pooled
+
+
+# One keep-alive pool for every GitHub call in this process
+session = build_session()
+
+# Authorization is chosen per request from the token pool
+token_pool = TokenPool(GITHUB_TOKENS, GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS)
+
+# url -> (etag, last_modified, response); replayed when GitHub answers 304
+_etag_cache = OrderedDict()
+_etag_lock = threading.Lock()
+etag_stats = {"hits": 0, "misses": 0}
+
+
+def rate_limit_stats() -> dict:
+    return token_pool.stats()
+
+
+def github_url(path_or_url: str) -> str:
+    if path_or_url.startswith("http"):
+        return path_or_url
+    return f"{GITHUB_API_BASE}{path_or_url}"
+
+
+def is_rate_limited(response: requests.Response) -> bool:
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and (
+        response.headers.get("X-RateLimit-Remaining") == "0"
+        or "Retry-After" in response.headers
+    )
+
+
+def send(method: str, url: str, resource: str = "core", **kwargs) -> requests.Response:
+    """
+    Sends a request with the pooled token that has the most rate limit
+    left. A rate-limited answer marks that token as exhausted and the
+    request is retried on another token, or after the earliest reset.
+    Waits and timeouts are cut short by the request deadline.
+    """
+    headers = kwargs.pop("headers", {})
+    connect_timeout, read_timeout = kwargs.pop("timeout", TIMEOUT)
+
+    endpoint = github_endpoint(urlparse(url).path)
+
+    for _ in range(len(token_pool.tokens) + 1):
+        budget = token_pool.acquire(resource, max_wait=time_left(token_pool.max_wait))
+        response = None
+        start = time.perf_counter()
+        try:
+            # time_left raises past the deadline; the finally below must
+            # still return the token's in-flight slot
+            kwargs["timeout"] = (time_left(connect_timeout), time_left(read_timeout))
+            response = session.request(
+                method, url, headers={**headers, **budget.auth_headers()}, **kwargs
+            )
+        except Exception as e:
+            GITHUB_ERRORS.labels(type(e).__name__).inc()
+            raise
+        finally:
+            status = str(response.status_code) if response is not None else "error"
+            GITHUB_CALL_SECONDS.labels(endpoint, status).observe(time.perf_counter() - start)
+            token_pool.release(budget, response.headers if response is not None else None)
+
+        if response.status_code >= 400:
+            GITHUB_ERRORS.labels("rate_limited" if is_rate_limited(response) else status).inc()
+
+        if not is_rate_limited(response):
+            return response
+
+        print(f"[GITHUB] rate limited on token {budget.label}, retrying")
+        response.close()
+
+    return response
+
+
+def github_get(path_or_url: str, params: dict | None = None) -> requests.Response:
+    """
+    GET against the GitHub API through the shared pool. Responses with an
+    ETag or Last-Modified are remembered, and repeat requests are sent as
+    conditional requests: a 304 (free of rate limit) returns the stored
+    response.
+    """
+    request = requests.Request("GET", github_url(path_or_url), params=params).prepare()
+    url = request.url
+
+    headers = {}
+    with _etag_lock:
+        cached = _etag_cache.get(url)
+        if cached:
+            _etag_cache.move_to_end(url)
+
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    response = send("GET", url, headers=headers)
+
+    revalidated = response.status_code == 304 and cached
+    with _etag_lock:
+        etag_stats["hits" if revalidated else "misses"] += 1
+    CACHE_EVENTS.labels("github_etag", "hit" if revalidated else "miss").inc()
+
+    if response.status_code == 304 and cached:
+        return cached[2]
+
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if response.status_code == 200 and (etag or last_modified):
+        # Reading .content loads the body now, so replays don't depend on
+        # the connection it came from
+        _ = response.content
+        with _etag_lock:
+            _etag_cache[url] = (etag, last_modified, response)
+            _etag_cache.move_to_end(url)
+            while len(_etag_cache) > GITHUB_ETAG_CACHE_SIZE:
+                _etag_cache.popitem(last=False)
+
+    return response
+
+
+def github_graphql(query: str, variables: dict) -> dict:
+    """
+    Runs a GraphQL query and returns its "data". GitHub's GraphQL API
+    only accepts authenticated requests.
+    """
+    if not token_pool.authenticated:
+        raise Exception("GitHub GraphQL API requires a token")
+
+    response = send(
+        "POST",
+        f"{GITHUB_API_BASE}/graphql",
+        resource="graphql",
+        json={"query": query, "variables": variables}
+    )
+
+    if response.status_code != 200:
+        raise Exception(f"GitHub GraphQL request failed ({response.status_code})")
+
+    payload = response.json()
+    if payload.get("errors"):
+        raise Exception(f"GitHub GraphQL errors: {payload['errors']}")
+
+    return payload["data"]
+
+
+def github_stream(path_or_url: str) -> requests.Response:
+    # Large downloads (tarballs) bypass the ETag cache
+    return send("GET", github_url(path_or_url), stream=True)
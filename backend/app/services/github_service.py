@@ -1,27 +1,37 @@
+from datetime import datetime
 from urllib.parse import urlparse
-import requests
-from backend.app.config import GITHUB_API_BASE, GITHUB_TOKEN
+from backend.app.services.github_client import github_get, github_graphql
+from backend.app.services.git_practices_analyzer import (
+    fetch_commits,
+    has_multiple_branches,
+    has_pull_requests
+)
 import os
 from git import Repo
-
-BASE_CLONE_DIR = "data/cloned_repos"
-
-
-import tempfile
-
-import shutil
 import subprocess
+from backend.app.services.clone_store import GIT_ENV
+from backend.app.utils.deadline import time_left
 
-def clone_repository(repo_url: str, repo_name: str) -> str:
-    base_dir = tempfile.mkdtemp(prefix="repoai_")
-    repo_path = os.path.join(base_dir, repo_name)
 
-    subprocess.run(
-        ["git", "clone", "--depth", "1", repo_url, repo_path],
-        check=True
+def resolve_head_sha(repo_url: str) -> str:
+    """
+    Returns the commit SHA the remote HEAD (default branch) points to,
+    without cloning or spending GitHub API quota.
+    """
+    result = subprocess.run(
+        ["git", "ls-remote", repo_url, "HEAD"],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=time_left(),
+        env=GIT_ENV
     )
 
-    return repo_path
+    line = result.stdout.strip().split("\n")[0]
+    if not line:
+        raise Exception("Remote HEAD not found")
+
+    return line.split()[0]
 
 
 
@@ -34,18 +44,8 @@ def extract_owner_repo(repo_url: str) -> tuple[str, str]:
     return owner, repo
 
 
-HEADERS = {
-    "Accept": "application/vnd.github+json",
-    "X-GitHub-Api-Version": "2022-11-28"
-}
-
-if GITHUB_TOKEN:
-    HEADERS["Authorization"] = f"Bearer {GITHUB_TOKEN}"
-
-
 def fetch_repo_metadata(owner: str, repo: str) -> dict:
-    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}"
-    response = requests.get(url, headers=HEADERS)
+    response = github_get(f"/repos/{owner}/{repo}")
 
     print("GitHub API STATUS:", response.status_code)
     print("GitHub API RESPONSE:", response.text)
@@ -57,13 +57,15 @@ def fetch_repo_metadata(owner: str, repo: str) -> dict:
 
 
 def fetch_commit_stats(owner: str, repo: str) -> dict:
-    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/commits"
-    response = requests.get(url, headers=HEADERS)
+    response = github_get(f"/repos/{owner}/{repo}/commits")
 
     if response.status_code != 200:
         raise Exception("Failed to fetch commits")
 
-    commits = response.json()
+    return commit_stats_from_commits(response.json())
+
+
+def commit_stats_from_commits(commits: list) -> dict:
     return {
         "total_commits_sampled": len(commits),
         "latest_commit_date": commits[0]["commit"]["author"]["date"]
@@ -72,10 +74,167 @@ def fetch_commit_stats(owner: str, repo: str) -> dict:
 
 
 def fetch_languages(owner: str, repo: str) -> dict:
-    url = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/languages"
-    response = requests.get(url, headers=HEADERS)
+    response = github_get(f"/repos/{owner}/{repo}/languages")
 
     if response.status_code != 200:
         raise Exception("Failed to fetch languages")
 
     return response.json()
+
+
+REPOSITORY_FACTS_QUERY = """
+query($owner: String!, $name: String!, $commits: Int!) {
+  repository(owner: $owner, name: $name) {
+    name
+    nameWithOwner
+    description
+    url
+    stargazerCount
+    forkCount
+    isArchived
+    isFork
+    createdAt
+    pushedAt
+    defaultBranchRef {
+      name
+      target {
+        ... on Commit {
+          history(first: $commits) {
+            totalCount
+            nodes {
+              message
+              committedDate
+              author { date }
+            }
+          }
+        }
+      }
+    }
+    refs(refPrefix: "refs/heads/") { totalCount }
+    pullRequests { totalCount }
+    languages(first: 100, orderBy: {field: SIZE, direction: DESC}) {
+      edges {
+        size
+        node { name }
+      }
+    }
+  }
+}
+"""
+
+# Same sample size as the first page of the REST /commits endpoint
+FACTS_COMMIT_SAMPLE = 30
+
+
+def fetch_repository_facts_graphql(owner: str, repo: str) -> dict:
+    data = github_graphql(
+        REPOSITORY_FACTS_QUERY,
+        {"owner": owner, "name": repo, "commits": FACTS_COMMIT_SAMPLE}
+    )
+
+    node = data.get("repository")
+    if node is None:
+        raise Exception("Failed to fetch repository metadata")
+
+    branch = node["defaultBranchRef"]
+    history = branch["target"]["history"] if branch else {"totalCount": 0, "nodes": []}
+
+    # Commits keep the REST shape so the git practice helpers accept both.
+    # GitActor and its date are nullable; committedDate never is.
+    commits = [
+        {
+            "commit": {
+                "message": c["message"],
+                "author": {"date": (c["author"] or {}).get("date") or c["committedDate"]}
+            }
+        }
+        for c in history["nodes"]
+    ]
+
+    return {
+        "metadata": {
+            "name": node["name"],
+            "full_name": node["nameWithOwner"],
+            "description": node["description"],
+            "html_url": node["url"],
+            "stargazers_count": node["stargazerCount"],
+            "forks_count": node["forkCount"],
+            "archived": node["isArchived"],
+            "fork": node["isFork"],
+            "created_at": node["createdAt"],
+            "pushed_at": node["pushedAt"],
+            "default_branch": branch["name"] if branch else None
+        },
+        "commits": commits,
+        "total_commits": history["totalCount"],
+        "has_multiple_branches": node["refs"]["totalCount"] > 1,
+        "has_pull_requests": node["pullRequests"]["totalCount"] > 0,
+        "languages": {e["node"]["name"]: e["size"] for e in node["languages"]["edges"]}
+    }
+
+
+def fetch_repository_facts_rest(owner: str, repo: str) -> dict:
+    metadata = fetch_repo_metadata(owner, repo)
+    commits = fetch_commits(owner, repo)
+
+    try:
+        languages = fetch_languages(owner, repo)
+    except Exception:
+        languages = None
+
+    return {
+        "metadata": metadata,
+        "commits": commits,
+        "total_commits": len(commits),
+        "has_multiple_branches": has_multiple_branches(owner, repo),
+        "has_pull_requests": has_pull_requests(owner, repo),
+        "languages": languages
+    }
+
+
+def fetch_repository_facts(owner: str, repo: str) -> dict:
+    """
+    Metadata, recent commits, branch and pull request presence and the
+    language breakdown in a single GraphQL round trip. Falls back to the
+    REST endpoints when GraphQL is unavailable (e.g. no token).
+    """
+    try:
+        return fetch_repository_facts_graphql(owner, repo)
+    except Exception as e:
+        print("[GRAPHQL FALLBACK] using REST endpoints:", e)
+        return fetch_repository_facts_rest(owner, repo)
+
+
+def iter_account_repositories(account: str, pushed_after: datetime | None = None):
+    """
+    Yields the public repositories of a user or organization, most
+    recently pushed first, following the API's Link pagination. With
+    pushed_after, listing stops at the first older repository.
+    """
+    params = {"type": "public", "sort": "pushed", "direction": "desc", "per_page": 100}
+
+    response = github_get(f"/orgs/{account}/repos", params)
+    if response.status_code == 404:
+        # Not an organization; user accounts only list their own repos
+        response = github_get(f"/users/{account}/repos", {**params, "type": "owner"})
+
+    while True:
+        if response.status_code == 404:
+            raise Exception(f"GitHub account '{account}' not found")
+        if response.status_code != 200:
+            raise Exception(f"Failed to list repositories ({response.status_code})")
+
+        for repo in response.json():
+            pushed_at = repo.get("pushed_at")
+            if pushed_after and pushed_at and parse_github_date(pushed_at) < pushed_after:
+                return
+            yield repo
+
+        next_url = response.links.get("next", {}).get("url")
+        if not next_url:
+            return
+        response = github_get(next_url)
+
+
+def parse_github_date(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
@@ -0,0 +1,169 @@
+import threading
+import time
+from dataclasses import dataclass
+
+# Budgets assumed for a token until GitHub reports the real numbers
+DEFAULT_LIMITS = {"authenticated": 5000, "anonymous": 60}
+
+
+class RateLimitExhausted(Exception):
+    pass
+
+
+@dataclass
+class TokenBudget:
+    token: str | None
+    resource: str
+    limit: int | None = None
+    remaining: int | None = None
+    reset_at: float = 0.0
+    in_flight: int = 0
+
+    @property
+    def label(self) -> str:
+        # Never expose a full token in logs or metrics
+        return f"...{self.token[-4:]}" if self.token else "anonymous"
+
+    def headroom(self, now: float) -> int:
+        # Requests already sent count against the budget until GitHub answers
+        if self.remaining is None or now >= self.reset_at:
+            kind = "authenticated" if self.token else "anonymous"
+            available = self.limit or DEFAULT_LIMITS[kind]
+        else:
+            available = self.remaining
+        return available - self.in_flight
+
+    def auth_headers(self) -> dict:
+        if not self.token:
+            return {}
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+class TokenPool:
+    """
+    Tracks X-RateLimit-Remaining / X-RateLimit-Reset per token and GitHub
+    rate limit resource ("core", "graphql", ...). acquire() hands out the
+    token with the most headroom; when every token is exhausted, callers
+    wait for the earliest reset instead of failing, for up to max_wait
+    seconds.
+    """
+
+    def __init__(self, tokens: list[str], max_wait: float):
+        self.tokens = list(tokens) or [None]
+        self.max_wait = max_wait
+        self._budgets = {}
+        self._condition = threading.Condition()
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.exhausted = 0
+
+    @property
+    def authenticated(self) -> bool:
+        return self.tokens != [None]
+
+    def _resource_budgets(self, resource: str) -> list[TokenBudget]:
+        if resource not in self._budgets:
+            self._budgets[resource] = [TokenBudget(t, resource) for t in self.tokens]
+        return self._budgets[resource]
+
+    def acquire(self, resource: str = "core", max_wait: float | None = None) -> TokenBudget:
+        deadline = time.monotonic() + (self.max_wait if max_wait is None else max_wait)
+        waited_since = None
+
+        with self._condition:
+            while True:
+                now = time.time()
+                budgets = self._resource_budgets(resource)
+                best = max(budgets, key=lambda b: b.headroom(now))
+
+                if best.headroom(now) > 0:
+                    best.in_flight += 1
+                    if waited_since is not None:
+                        self.wait_seconds += time.monotonic() - waited_since
+                    return best
+
+                if waited_since is None:
+                    waited_since = time.monotonic()
+                    self.waits += 1
+
+                # Wake up at the earliest reset, or sooner when a response
+                # frees an in-flight slot
+                next_reset = min(b.reset_at for b in budgets if b.reset_at > now) \
+                    if any(b.reset_at > now for b in budgets) else now + 1
+                timeout = min(next_reset - now, deadline - time.monotonic())
+
+                if timeout <= 0:
+                    self.exhausted += 1
+                    self.wait_seconds += time.monotonic() - waited_since
+                    raise RateLimitExhausted(
+                        f"GitHub {resource} rate limit exhausted for all "
+                        f"{len(budgets)} token(s)"
+                    )
+
+                self._condition.wait(timeout)
+
+    def release(self, budget: TokenBudget, headers: dict | None = None) -> None:
+        """
+        Frees the slot taken by acquire() and records the budget GitHub
+        reported. Responses without rate limit headers (e.g. redirects to
+        codeload) leave the budget unchanged.
+        """
+        with self._condition:
+            budget.in_flight -= 1
+            if headers:
+                self._update(budget, headers)
+            self._condition.notify_all()
+
+    def _update(self, budget: TokenBudget, headers: dict) -> None:
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        limit = headers.get("X-RateLimit-Limit")
+        resource = headers.get("X-RateLimit-Resource")
+
+        if resource and resource != budget.resource:
+            # The request was billed to another bucket than the caller
+            # expected; record it there
+            budget = next(
+                b for b in self._resource_budgets(resource) if b.token == budget.token
+            )
+
+        if remaining is not None and reset is not None:
+            budget.remaining = int(remaining)
+            budget.reset_at = float(reset)
+        if limit is not None:
+            budget.limit = int(limit)
+
+        # Secondary rate limits only send Retry-After
+        retry_after = headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            budget.remaining = 0
+            budget.reset_at = max(budget.reset_at, time.time() + int(retry_after))
+
+    def stats(self) -> dict:
+        with self._condition:
+            now = time.time()
+            tokens = [
+                {
+                    "token": b.label,
+                    "resource": b.resource,
+                    "limit": b.limit,
+                    "remaining": b.remaining if b.remaining is not None and now < b.reset_at else b.limit,
+                    "reset_in_seconds": max(0, round(b.reset_at - now)),
+                    "in_flight": b.in_flight
+                }
+                for budgets in self._budgets.values()
+                for b in budgets
+            ]
+
+            remaining = {}
+            for t in tokens:
+                if t["remaining"] is not None:
+                    remaining[t["resource"]] = remaining.get(t["resource"], 0) + t["remaining"]
+
+            return {
+                "tokens": tokens,
+                "remaining": remaining,
+                "waits": self.waits,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "exhausted": self.exhausted
+            }
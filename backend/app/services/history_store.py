@@ -0,0 +1,217 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+
+from backend.app.config import HISTORY_DB_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY,
+    owner TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    commit_sha TEXT,
+    depth TEXT NOT NULL,
+    analyzed_at REAL NOT NULL,
+    total_score INTEGER NOT NULL,
+    level TEXT NOT NULL,
+    coverage REAL NOT NULL,
+    partial INTEGER NOT NULL,
+    score TEXT NOT NULL,
+    result BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS analyses_repo_time ON analyses (owner, repo, analyzed_at);
+CREATE INDEX IF NOT EXISTS analyses_score ON analyses (total_score);
+"""
+
+# Columns of a history point; the compressed result is only read by latest()
+POINT_COLUMNS = "commit_sha, depth, analyzed_at, total_score, level, coverage, partial, score"
+
+
+def timestamp_to_iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+# A row is partial when the deadline cut its analysis short or a stage was
+# degraded or skipped by a failure (see is_complete in analysis_pipeline)
+def point_from_row(row: sqlite3.Row) -> dict:
+    return {
+        "commit_sha": row["commit_sha"],
+        "depth": row["depth"],
+        "analyzed_at": timestamp_to_iso(row["analyzed_at"]),
+        "total_score": row["total_score"],
+        "level": row["level"],
+        "coverage": row["coverage"],
+        "partial": bool(row["partial"]),
+        "score": json.loads(row["score"])
+    }
+
+
+class HistoryStore:
+    """
+    Every completed analysis, in an SQLite database shared by all worker
+    processes on the host. WAL mode lets readers run while another process
+    writes; each thread opens its own connection on first use.
+
+    Owner and repository are stored lowercased, matching the result cache
+    keys. The full response (every analyzer model) is stored compressed,
+    after the columns the trend queries read.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+
+        return connection
+
+    def record(self, owner: str, repo: str, response: dict, partial: bool) -> None:
+        score = response["score"]
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT INTO analyses (owner, repo, commit_sha, depth, analyzed_at, total_score,"
+                " level, coverage, partial, score, result) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    owner.lower(),
+                    repo.lower(),
+                    response.get("commit_sha"),
+                    response["depth"],
+                    time.time(),
+                    score["total_score"],
+                    score["level"],
+                    score["coverage"],
+                    int(partial),
+                    json.dumps(score),
+                    zlib.compress(json.dumps(response, default=str).encode())
+                )
+            )
+
+    def history(
+        self,
+        owner: str,
+        repo: str,
+        since: float | None = None,
+        until: float | None = None,
+        depth: str | None = None,
+        limit: int = 1000
+    ) -> list[dict]:
+        """
+        Score time series, oldest first: the most recent `limit` analyses
+        between since and until (unix timestamps).
+        """
+        query = f"SELECT {POINT_COLUMNS} FROM analyses WHERE owner = ? AND repo = ?"
+        params = [owner.lower(), repo.lower()]
+
+        if since is not None:
+            query += " AND analyzed_at >= ?"
+            params.append(since)
+        if until is not None:
+            query += " AND analyzed_at <= ?"
+            params.append(until)
+        if depth is not None:
+            query += " AND depth = ?"
+            params.append(depth)
+
+        query += " ORDER BY analyzed_at DESC LIMIT ?"
+        params.append(limit)
+
+        rows = self._connection().execute(query, params).fetchall()
+        return [point_from_row(row) for row in reversed(rows)]
+
+    def latest(
+        self,
+        owner: str,
+        repo: str,
+        depth: str | None = None,
+        include_partial: bool = False
+    ) -> dict | None:
+        """
+        Most recent stored analysis. Partial results are left out unless
+        include_partial is set, so a partial run never hides an older
+        complete one.
+        """
+        query = "SELECT analyzed_at, partial, result FROM analyses WHERE owner = ? AND repo = ?"
+        params = [owner.lower(), repo.lower()]
+
+        if not include_partial:
+            query += " AND partial = 0"
+        if depth is not None:
+            query += " AND depth = ?"
+            params.append(depth)
+
+        row = self._connection().execute(
+            query + " ORDER BY analyzed_at DESC LIMIT 1", params
+        ).fetchone()
+        if row is None:
+            return None
+
+        result = json.loads(zlib.decompress(row["result"]))
+        return {
+            **result,
+            "partial": bool(row["partial"]),
+            "analyzed_at": timestamp_to_iso(row["analyzed_at"])
+        }
+
+    def top(
+        self,
+        limit: int,
+        since: float | None = None,
+        include_partial: bool = False
+    ) -> list[dict]:
+        """
+        Best score of each repository, highest first. Rows are read in
+        score index order and stop as soon as `limit` repositories are
+        found, instead of grouping the whole table. Partial results are
+        left out unless include_partial is set.
+        """
+        query = f"SELECT owner, repo, {POINT_COLUMNS} FROM analyses"
+        conditions = []
+        params = []
+
+        if not include_partial:
+            conditions.append("partial = 0")
+        if since is not None:
+            conditions.append("analyzed_at >= ?")
+            params.append(since)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        query += " ORDER BY total_score DESC"
+
+        best = {}
+        for row in self._connection().execute(query, params):
+            name = f"{row['owner']}/{row['repo']}"
+            if name not in best:
+                best[name] = {"repository": name, **point_from_row(row)}
+                if len(best) >= limit:
+                    break
+
+        return list(best.values())
+
+
+history_store = HistoryStore(HISTORY_DB_PATH)
+
+
+def record_analysis(owner: str, repo: str, response: dict, partial: bool) -> None:
+    # History is a side record: a failed write never fails the analysis
+    try:
+        history_store.record(owner, repo, response, partial)
+    except Exception as e:
+        print("[HISTORY] could not record analysis:", e)
@@ -0,0 +1,206 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from backend.app.config import (
+    PYLINT_WORKERS,
+    PYLINT_SHARD_MAX_FILES,
+    PYLINT_SHARD_TIMEOUT_SECONDS
+)
+from backend.app.utils.deadline import current_deadline, time_left
+
+MESSAGE_TYPES = ("fatal", "error", "warning", "refactor", "convention", "info")
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+@dataclass
+class ShardResult:
+    files: int
+    statements: int
+    counts: dict
+    # Weighted message count of every file in the shard
+    file_penalties: dict = field(default_factory=dict)
+
+
+@dataclass
+class LintResult:
+    score: float | None
+    shards_total: int
+    shards_failed: int
+    file_penalties: dict = field(default_factory=dict)
+
+    @property
+    def partial(self) -> bool:
+        return self.shards_failed > 0
+
+
+def get_lint_executor() -> ThreadPoolExecutor:
+    """
+    One set of PYLINT_WORKERS slots for every analysis in this process, so
+    concurrent analyses queue their shards instead of oversubscribing the
+    CPU with pylint subprocesses.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=PYLINT_WORKERS, thread_name_prefix="pylint")
+        return _executor
+
+
+def weighted_penalty(counts: dict) -> int:
+    # The message weights of pylint's default evaluation
+    return 5 * counts["error"] + counts["warning"] + counts["refactor"] + counts["convention"]
+
+
+def shard_files(files: list[str], max_files: int) -> list[list[str]]:
+    """
+    Groups files by top-level package so related modules are linted
+    together, packing small packages into shared shards and splitting big
+    ones into chunks of at most max_files.
+    """
+    packages = defaultdict(list)
+    for path in sorted(files):
+        parts = path.split("/")
+        packages[parts[0] if len(parts) > 1 else ""].append(path)
+
+    shards = []
+    current = []
+    for package in sorted(packages):
+        members = packages[package]
+
+        if len(current) + len(members) > max_files and current:
+            shards.append(current)
+            current = []
+
+        while len(members) > max_files:
+            shards.append(members[:max_files])
+            members = members[max_files:]
+
+        current.extend(members)
+
+    if current:
+        shards.append(current)
+
+    return shards
+
+
+def lint_shard(
+    repo_root: str,
+    files: list[str],
+    timeout: float,
+    deadline: float | None = None
+) -> ShardResult:
+    # With --evaluation=statement pylint reports the shard's statement count
+    # as its "score", which lets the shards be combined into one exact score.
+    # Shards queued for a slot past the request deadline do not start.
+    #
+    # The analyzed repository must not run code on the server: pylint starts
+    # in an empty directory under -I, so a top-level "pylint" package in the
+    # repository is never imported, and with an empty rcfile, so no
+    # init-hook or plugins are loaded from its .pylintrc or pyproject.toml.
+    root = os.path.abspath(repo_root)
+    paths = {os.path.join(root, *path.split("/")): path for path in files}
+
+    with tempfile.TemporaryDirectory(prefix="repoai_pylint_") as neutral_dir:
+        result = subprocess.run(
+            [
+                sys.executable, "-I", "-m", "pylint",
+                *paths,
+                f"--rcfile={os.devnull}",
+                "--output-format=json2",
+                "--evaluation=statement",
+                "--persistent=n"
+            ],
+            cwd=neutral_dir,
+            capture_output=True,
+            text=True,
+            timeout=time_left(timeout, deadline)
+        )
+
+    output = json.loads(result.stdout)
+    stats = output["statistics"]
+    counts = stats["messageTypeCount"]
+
+    file_counts = {path: dict.fromkeys(MESSAGE_TYPES, 0) for path in files}
+    for message in output["messages"]:
+        path = paths.get(message.get("absolutePath") or message["path"])
+        if path in file_counts and message["type"] in MESSAGE_TYPES:
+            file_counts[path][message["type"]] += 1
+
+    return ShardResult(
+        files=len(files),
+        statements=int(stats.get("score") or 0),
+        counts={t: counts.get(t, 0) for t in MESSAGE_TYPES},
+        # Fatal messages weigh like errors here; per-file figures only feed
+        # the sampled score estimate
+        file_penalties={
+            path: weighted_penalty(c) + 5 * c["fatal"] for path, c in file_counts.items()
+        }
+    )
+
+
+def combine_scores(shards: list[ShardResult]) -> float | None:
+    """
+    Applies pylint's default evaluation to the totals of all shards:
+    10 - ((5 * error + warning + refactor + convention) / statement) * 10
+    """
+    statements = sum(s.statements for s in shards)
+    if statements == 0:
+        return None
+
+    totals = {t: sum(s.counts[t] for s in shards) for t in MESSAGE_TYPES}
+    if totals["fatal"]:
+        return 0.0
+
+    weighted = weighted_penalty(totals)
+    return round(max(0.0, 10.0 - (weighted / statements) * 10), 2)
+
+
+def run_sharded_pylint(
+    repo_root: str,
+    files: list[str],
+    timeout: float = PYLINT_SHARD_TIMEOUT_SECONDS
+) -> LintResult:
+    """
+    Lints files (relative to repo_root) in parallel shards, each with its
+    own timeout, cut short by the request deadline. Shards that fail or
+    time out are left out of the score.
+    """
+    if not files:
+        return LintResult(score=None, shards_total=0, shards_failed=0)
+
+    shards = shard_files(files, PYLINT_SHARD_MAX_FILES)
+    finished = []
+    failed = 0
+
+    # The shards run on the shared executor, outside this request's context
+    deadline = current_deadline()
+    executor = get_lint_executor()
+    futures = [
+        executor.submit(lint_shard, repo_root, shard, timeout, deadline)
+        for shard in shards
+    ]
+    for future in futures:
+        try:
+            finished.append(future.result())
+        except subprocess.TimeoutExpired as e:
+            print(f"[PYLINT] shard timed out after {e.timeout:.1f}s")
+            failed += 1
+        except Exception as e:
+            print("[PYLINT] shard failed:", e)
+            failed += 1
+
+    return LintResult(
+        score=combine_scores(finished),
+        shards_total=len(shards),
+        shards_failed=failed,
+        file_penalties={p: v for s in finished for p, v in s.file_penalties.items()}
+    )
@@ -0,0 +1,43 @@
+import hashlib
+import re
+
+from backend.app.config import LLM_CACHE_DIR, LLM_CACHE_MAX_BYTES, LLM_CACHE_TTL_SECONDS
+from backend.app.utils.cache import DiskCache
+
+completion_cache = DiskCache(LLM_CACHE_DIR, LLM_CACHE_MAX_BYTES, LLM_CACHE_TTL_SECONDS)
+
+
+def normalize_prompt(text: str) -> str:
+    # Indentation and blank lines in the prompt templates don't change the
+    # completion, so they don't split the cache either
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def completion_cache_key(
+    model: str,
+    temperature: float,
+    max_tokens: int | None,
+    system: str,
+    prompt: str
+) -> str:
+    digest = hashlib.sha256(
+        f"{normalize_prompt(system)}\0{normalize_prompt(prompt)}".encode("utf-8")
+    ).hexdigest()
+    return f"{model}|t={temperature}|max={max_tokens}|{digest}"
+
+
+def get_cached_completion(key: str) -> str | None:
+    return completion_cache.get(key)
+
+
+def store_completion(key: str, text: str) -> None:
+    try:
+        completion_cache.set(key, text)
+    except Exception as e:
+        print("[LLM CACHE] disk write failed:", e)
+
+
+def llm_cache_stats() -> dict:
+    stats = completion_cache.stats()
+    lookups = stats["hits"] + stats["misses"]
+    return {**stats, "hit_rate": round(stats["hits"] / lookups, 3) if lookups else None}
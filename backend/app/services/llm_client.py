@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from groq import AsyncGroq
+
+from backend.app.config import GROQ_API_KEY, LLM_MODEL, LLM_DEADLINE_SECONDS
+from backend.app.services.llm_cache import (
+    completion_cache_key,
+    get_cached_completion,
+    store_completion
+)
+from backend.app.utils.metrics import CACHE_EVENTS, LLM_CALL_SECONDS
+
+_loop = None
+_client = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Event loop, on a daemon thread, that every LLM call of this process
+    runs on. Pipeline stages are plain threads, so they hand their
+    coroutines over with submit().
+    """
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-loop", daemon=True).start()
+        return _loop
+
+
+def get_client() -> AsyncGroq:
+    # Created on first use so a missing key only fails LLM calls (which
+    # have fallbacks), not the import of the app
+    global _client
+    with _lock:
+        if _client is None:
+            _client = AsyncGroq(
+                api_key=GROQ_API_KEY,
+                timeout=LLM_DEADLINE_SECONDS,
+                max_retries=1
+            )
+        return _client
+
+
+def submit(coro) -> Future:
+    return asyncio.run_coroutine_threadsafe(coro, get_loop())
+
+
+async def chat_completion(
+    system: str,
+    prompt: str,
+    temperature: float,
+    max_tokens: int | None = None,
+    validate: Callable[[str], Any] | None = None,
+    call: str = "completion"
+) -> str:
+    """
+    Completion for the prompt, served from the completion cache when the
+    same model, temperature and normalized prompt were seen before.
+    validate(text) must not raise for a completion to be cached, so
+    unparseable answers are retried next time instead of replayed.
+    call names the call in metrics.
+    """
+    start = time.perf_counter()
+    key = completion_cache_key(LLM_MODEL, temperature, max_tokens, system, prompt)
+
+    cached = await asyncio.to_thread(get_cached_completion, key)
+    CACHE_EVENTS.labels("llm", "miss" if cached is None else "hit").inc()
+    if cached is not None:
+        LLM_CALL_SECONDS.labels(call, "cached").observe(time.perf_counter() - start)
+        return cached
+
+    kwargs = {"max_tokens": max_tokens} if max_tokens else {}
+
+    try:
+        response = await get_client().chat.completions.create(
+            model=LLM_MODEL,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            **kwargs
+        )
+    except asyncio.CancelledError:
+        LLM_CALL_SECONDS.labels(call, "cancelled").observe(time.perf_counter() - start)
+        raise
+    except Exception:
+        LLM_CALL_SECONDS.labels(call, "error").observe(time.perf_counter() - start)
+        raise
+
+    LLM_CALL_SECONDS.labels(call, "ok").observe(time.perf_counter() - start)
+
+    text = response.choices[0].message.content
+
+    try:
+        if validate is not None:
+            validate(text)
+    except Exception:
+        return text
+
+    await asyncio.to_thread(store_completion, key, text)
+    return text
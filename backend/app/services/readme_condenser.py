@@ -0,0 +1,200 @@
+import re
+from dataclasses import dataclass
+
+# Rough size of a token for English Markdown; good enough for budgeting
+# without shipping a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Longest code block kept from a section, in lines
+MAX_CODE_LINES = 15
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+FENCE_RE = re.compile(r"^\s*(```|~~~)")
+
+BADGE_RE = re.compile(r"\[!\[[^\]]*\]\([^)]*\)\]\([^)]*\)")
+IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)|!\[[^\]]*\]\[[^\]]*\]")
+LINK_RE = re.compile(r"\[([^\]]+)\]\([^)]*\)")
+LINK_DEFINITION_RE = re.compile(r"^\s*\[[^\]]+\]:\s*\S+.*$", re.MULTILINE)
+HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+HTML_BLOCK_RE = re.compile(r"<(picture|svg|table|details)\b.*?</\1>", re.DOTALL | re.IGNORECASE)
+HTML_TAG_RE = re.compile(r"</?[a-zA-Z][^>]*>")
+RULE_RE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$", re.MULTILINE)
+
+# Heading keywords and how useful the section is for explaining the project
+SECTION_WEIGHTS = [
+    (("overview", "about", "introduction", "what is", "purpose", "motivation", "why"), 5),
+    (("architecture", "design", "how it works", "components", "structure", "modules", "concepts"), 4),
+    (("features", "usage", "getting started", "quick start", "quickstart", "example", "demo"), 3),
+    (("install", "setup", "requirements", "configuration", "api"), 2),
+    (("changelog", "release", "license", "contributor", "contributing", "acknowledg",
+      "sponsor", "backers", "citation", "star history", "code of conduct", "support", "faq",
+      "table of contents"), -5),
+]
+
+
+@dataclass
+class ReadmeSection:
+    heading: str
+    level: int
+    body: str
+    position: int
+
+    @property
+    def text(self) -> str:
+        if not self.heading:
+            return self.body
+        return f"{'#' * self.level} {self.heading}\n{self.body}".strip()
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def strip_noise(markdown: str) -> str:
+    """
+    Removes badges, images, raw HTML and link targets, keeping the
+    visible text.
+    """
+    text = HTML_COMMENT_RE.sub("", markdown)
+    text = HTML_BLOCK_RE.sub("", text)
+    text = BADGE_RE.sub("", text)
+    text = IMAGE_RE.sub("", text)
+    text = LINK_RE.sub(r"\1", text)
+    text = LINK_DEFINITION_RE.sub("", text)
+    text = HTML_TAG_RE.sub("", text)
+    text = RULE_RE.sub("", text)
+
+    # Collapse the blank lines the removals leave behind
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def shorten_code_blocks(lines: list[str]) -> list[str]:
+    result = []
+    in_code = False
+    code_lines = 0
+
+    for line in lines:
+        if FENCE_RE.match(line):
+            if in_code and code_lines > MAX_CODE_LINES:
+                result.append("...")
+            in_code = not in_code
+            code_lines = 0
+            result.append(line)
+            continue
+
+        if in_code:
+            code_lines += 1
+            if code_lines > MAX_CODE_LINES:
+                continue
+
+        result.append(line)
+
+    return result
+
+
+def parse_sections(markdown: str) -> list[ReadmeSection]:
+    sections = []
+    heading, level, body = "", 0, []
+    in_code = False
+
+    for line in markdown.splitlines():
+        if FENCE_RE.match(line):
+            in_code = not in_code
+
+        match = None if in_code else HEADING_RE.match(line)
+        if match:
+            sections.append(ReadmeSection(heading, level, "\n".join(body).strip(), len(sections)))
+            heading, level, body = match.group(2), len(match.group(1)), []
+        else:
+            body.append(line)
+
+    sections.append(ReadmeSection(heading, level, "\n".join(body).strip(), len(sections)))
+
+    for section in sections:
+        section.body = "\n".join(shorten_code_blocks(section.body.splitlines()))
+
+    return [s for s in sections if s.body or s.level == 1]
+
+
+def section_weight(section: ReadmeSection, title_position: int | None = None) -> int:
+    heading = section.heading.lower()
+
+    # Boilerplate is dropped at any heading level, since some READMEs use
+    # "#" for every section
+    for keywords, weight in SECTION_WEIGHTS:
+        if weight < 0 and any(k in heading for k in keywords):
+            return weight
+
+    # The text before the first heading and the title section usually say
+    # what the project is
+    if not section.heading or section.position == title_position:
+        return 6
+    if not section.body:
+        return -1
+
+    for keywords, weight in SECTION_WEIGHTS:
+        if any(k in heading for k in keywords):
+            return weight
+    return 0
+
+
+def title_position(sections: list[ReadmeSection]) -> int | None:
+    # The title is the first heading, when it is a top-level one
+    headed = [s for s in sections if s.heading]
+    if headed and headed[0].level == 1:
+        return headed[0].position
+    return None
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+
+    # Cut at a paragraph, or at least a line, boundary when possible
+    cut = text[:limit]
+    for separator in ("\n\n", "\n"):
+        index = cut.rfind(separator)
+        if index > limit // 2:
+            return cut[:index].rstrip() + "\n..."
+    return cut.rstrip() + "..."
+
+
+def condense_readme(markdown: str, max_tokens: int) -> str:
+    """
+    Digest of the README that fits max_tokens: noise is stripped, sections
+    are ranked by how much they say about purpose, usage and architecture,
+    and the best ones are kept in their original order.
+    """
+    if not markdown.strip():
+        return ""
+
+    cleaned = strip_noise(markdown)
+    if estimate_tokens(cleaned) <= max_tokens:
+        return cleaned
+
+    sections = parse_sections(cleaned)
+    title = title_position(sections)
+    weights = {s.position: section_weight(s, title) for s in sections}
+    # Most relevant first; earlier sections win ties
+    ranked = sorted(sections, key=lambda s: (-weights[s.position], s.position))
+
+    kept = {}
+    remaining = max_tokens
+    for section in ranked:
+        weight = weights[section.position]
+        if remaining <= 0 or weight < 0:
+            break
+
+        text = section.text
+        cost = estimate_tokens(text) + 1
+        if cost <= remaining:
+            kept[section.position] = text
+            remaining -= cost
+        elif weight >= 3 and remaining >= 50:
+            # Part of a highly relevant section beats smaller, less
+            # relevant ones
+            kept[section.position] = truncate_to_tokens(text, remaining - 1)
+            remaining = 0
+
+    return "\n\n".join(kept[p] for p in sorted(kept))
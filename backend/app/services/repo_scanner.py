@@ -0,0 +1,158 @@
+import os
+import shutil
+import tempfile
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+# Directories that are never part of the analyzed source tree
+PRUNED_DIRS = {".git"}
+
+
+@dataclass(slots=True)
+class FileEntry:
+    path: str      # relative to the repo root, always "/"-separated
+    name: str
+    ext: str
+    size: int
+    depth: int     # number of path components ("src/app.py" -> 2)
+    is_dir: bool
+
+
+@dataclass
+class RepoManifest:
+    """
+    Result of a single walk over a repository. Every filesystem analyzer
+    reads from this instead of walking the tree again.
+
+    A manifest either points at a checkout on disk (root) or holds the text
+    of its files in memory (contents, keyed by relative path).
+    """
+    root: str | None
+    entries: list[FileEntry] = field(default_factory=list)
+    contents: dict[str, str] | None = None
+
+    def __post_init__(self):
+        self._by_path = {e.path: e for e in self.entries}
+        self.files = [e for e in self.entries if not e.is_dir]
+        self.directories = [e for e in self.entries if e.is_dir]
+
+    def root_entries(self) -> list[FileEntry]:
+        return [e for e in self.entries if e.depth == 1]
+
+    def get(self, rel_path: str) -> FileEntry | None:
+        return self._by_path.get(rel_path)
+
+    def exists(self, rel_path: str) -> bool:
+        return rel_path in self._by_path
+
+    def files_with_ext(self, ext: str) -> list[FileEntry]:
+        return [e for e in self.files if e.ext == ext]
+
+    def abs_path(self, rel_path: str) -> str:
+        return os.path.join(self.root, *rel_path.split("/"))
+
+    def read_text(self, rel_path: str) -> str:
+        if self.contents is not None:
+            return self.contents.get(rel_path, "")
+
+        try:
+            with open(self.abs_path(rel_path), "r", encoding="utf-8", errors="ignore") as f:
+                return f.read()
+        except Exception:
+            return ""
+
+    @contextmanager
+    def materialize(self, rel_paths: list[str]):
+        """
+        Yields a directory containing rel_paths, for tools such as pylint
+        that only read from disk. In-memory manifests write just those
+        files to a temporary directory that is removed afterwards.
+        """
+        if self.contents is None:
+            yield self.root
+            return
+
+        tmp_dir = tempfile.mkdtemp(prefix="repoai_")
+        try:
+            for rel_path in rel_paths:
+                target = os.path.join(tmp_dir, *rel_path.split("/"))
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with open(target, "w", encoding="utf-8") as f:
+                    f.write(self.read_text(rel_path))
+            yield tmp_dir
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def scan_repository(repo_path: str) -> RepoManifest:
+    """
+    Walks the repository exactly once and records every file and directory
+    with its size, extension and depth.
+    """
+    entries = []
+    stack = [("", 0)]
+
+    while stack:
+        rel_dir, depth = stack.pop()
+        abs_dir = os.path.join(repo_path, rel_dir) if rel_dir else repo_path
+
+        try:
+            with os.scandir(abs_dir) as it:
+                dir_entries = sorted(it, key=lambda d: d.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for d in dir_entries:
+            rel = f"{rel_dir}/{d.name}" if rel_dir else d.name
+
+            try:
+                is_dir = d.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+
+            if is_dir:
+                if d.name in PRUNED_DIRS:
+                    continue
+                entries.append(FileEntry(rel, d.name, "", 0, depth + 1, True))
+                subdirs.append((rel, depth + 1))
+                continue
+
+            if d.name in PRUNED_DIRS:
+                continue
+
+            try:
+                size = d.stat(follow_symlinks=False).st_size
+            except OSError:
+                size = 0
+
+            ext = os.path.splitext(d.name)[1]
+            entries.append(FileEntry(rel, d.name, ext, size, depth + 1, False))
+
+        # Reverse so directories are visited in name order
+        stack.extend(reversed(subdirs))
+
+    return RepoManifest(root=repo_path, entries=entries)
+
+
+def order_entries(entries: list[FileEntry]) -> list[FileEntry]:
+    """
+    Arranges entries collected in any order (e.g. from an archive) the way
+    scan_repository emits them: each directory's children sorted by name,
+    shallower levels before the directories below them.
+    """
+    children = defaultdict(list)
+    for entry in entries:
+        parent = entry.path.rpartition("/")[0]
+        children[parent].append(entry)
+
+    ordered = []
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        siblings = sorted(children.get(rel_dir, []), key=lambda e: e.name)
+        ordered.extend(siblings)
+        stack.extend(reversed([e.path for e in siblings if e.is_dir]))
+
+    return ordered
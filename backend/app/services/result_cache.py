@@ -0,0 +1,41 @@
+from backend.app.config import (
+    RESULT_CACHE_MEMORY_MAX_BYTES,
+    RESULT_CACHE_MEMORY_TTL_SECONDS,
+    RESULT_CACHE_DIR,
+    RESULT_CACHE_DISK_MAX_BYTES,
+    RESULT_CACHE_DISK_TTL_SECONDS
+)
+from backend.app.utils.cache import MemoryCache, DiskCache
+from backend.app.utils.metrics import CACHE_EVENTS
+
+memory_tier = MemoryCache(RESULT_CACHE_MEMORY_MAX_BYTES, RESULT_CACHE_MEMORY_TTL_SECONDS)
+disk_tier = DiskCache(RESULT_CACHE_DIR, RESULT_CACHE_DISK_MAX_BYTES, RESULT_CACHE_DISK_TTL_SECONDS)
+
+
+def analysis_cache_key(owner: str, repo: str, head_sha: str, depth: str = "standard") -> str:
+    return f"{owner.lower()}/{repo.lower()}@{head_sha}:{depth}"
+
+
+def get_cached_analysis(key: str) -> dict | None:
+    result = memory_tier.get(key)
+    if result is not None:
+        CACHE_EVENTS.labels("analysis", "memory").inc()
+        return result
+
+    result = disk_tier.get(key)
+    if result is not None:
+        # Promote so the next hit in this worker skips the disk read
+        memory_tier.set(key, result)
+        CACHE_EVENTS.labels("analysis", "disk").inc()
+    else:
+        CACHE_EVENTS.labels("analysis", "miss").inc()
+
+    return result
+
+
+def store_analysis(key: str, result: dict) -> None:
+    memory_tier.set(key, result)
+    try:
+        disk_tier.set(key, result)
+    except Exception as e:
+        print("[RESULT CACHE] disk write failed:", e)
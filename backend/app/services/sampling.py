@@ -0,0 +1,196 @@
+import math
+import random
+import statistics
+import zlib
+from dataclasses import dataclass
+
+from backend.app.config import (
+    SAMPLING_MIN_FILES,
+    SAMPLING_MIN_LINES,
+    SAMPLE_FILES,
+    SAMPLING_MAX_DIRECTORIES,
+    SAMPLING_CONFIDENCE
+)
+from backend.app.models.analysis_models import EstimateInterval, SamplingReport
+
+# Directories beyond the SAMPLING_MAX_DIRECTORIES largest share one stratum
+OTHER_DIRECTORY = "(other)"
+
+
+@dataclass
+class SamplePlan:
+    # (top-level directory, size band) -> every file / the sampled files
+    strata: dict[tuple[str, str], list[str]]
+    sample: dict[tuple[str, str], list[str]]
+
+    @property
+    def paths(self) -> list[str]:
+        return sorted(p for files in self.sample.values() for p in files)
+
+    @property
+    def population_size(self) -> int:
+        return sum(len(files) for files in self.strata.values())
+
+
+def needs_sampling(file_count: int, total_lines: int) -> bool:
+    return file_count >= SAMPLING_MIN_FILES or total_lines >= SAMPLING_MIN_LINES
+
+
+def top_directory(path: str) -> str:
+    return path.split("/", 1)[0] if "/" in path else "."
+
+
+def stratify(sizes: dict[str, int], max_directories: int) -> dict[tuple[str, str], list[str]]:
+    """
+    Groups files by top-level directory and by size tercile, so the sample
+    covers every part of the tree and both small and large modules.
+    """
+    ordered = sorted(sizes.values())
+    small_below = ordered[len(ordered) // 3]
+    large_from = ordered[2 * len(ordered) // 3]
+
+    directory_sizes = {}
+    for path in sizes:
+        directory = top_directory(path)
+        directory_sizes[directory] = directory_sizes.get(directory, 0) + 1
+    kept = set(sorted(directory_sizes, key=directory_sizes.get, reverse=True)[:max_directories])
+
+    strata = {}
+    for path, size in sorted(sizes.items()):
+        directory = top_directory(path)
+        if directory not in kept:
+            directory = OTHER_DIRECTORY
+
+        if size < small_below:
+            band = "small"
+        elif size < large_from:
+            band = "medium"
+        else:
+            band = "large"
+
+        strata.setdefault((directory, band), []).append(path)
+
+    return strata
+
+
+def allocate(strata: dict[tuple[str, str], list[str]], sample_size: int) -> dict[tuple[str, str], int]:
+    # Proportional allocation, with at least two files per stratum so its
+    # variance can be estimated
+    total = sum(len(files) for files in strata.values())
+    return {
+        key: min(len(files), max(2, round(sample_size * len(files) / total)))
+        for key, files in strata.items()
+    }
+
+
+def plan_sample(sizes: dict[str, int], sample_size: int = SAMPLE_FILES) -> SamplePlan:
+    """
+    Picks a stratified random sample of files (path -> size in bytes).
+    The generator is seeded from the file list, so the same tree always
+    gets the same sample and its results stay reproducible and cacheable.
+    """
+    rng = random.Random(zlib.crc32("\n".join(sorted(sizes)).encode()))
+    strata = stratify(sizes, SAMPLING_MAX_DIRECTORIES)
+    counts = allocate(strata, sample_size)
+
+    sample = {key: sorted(rng.sample(files, counts[key])) for key, files in strata.items()}
+    return SamplePlan(strata=strata, sample=sample)
+
+
+def ratio_estimate(
+    plan: SamplePlan,
+    values: dict[str, tuple[float, float]],
+    confidence: float = SAMPLING_CONFIDENCE
+) -> tuple[float, float, float] | None:
+    """
+    Combined ratio estimate of sum(y) / sum(x) over every file, from the
+    (y, x) values of the sampled files, with a normal-approximation
+    confidence interval: (lower, estimate, upper). Sampled files missing
+    from values (e.g. in a failed pylint shard) are left out.
+    """
+    y_total = 0.0
+    x_total = 0.0
+    measured = []
+
+    for key, files in plan.strata.items():
+        sampled = [values[p] for p in plan.sample[key] if p in values]
+        if not sampled:
+            continue
+
+        weight = len(files) / len(sampled)
+        y_total += weight * sum(y for y, _ in sampled)
+        x_total += weight * sum(x for _, x in sampled)
+        measured.append((len(files), sampled))
+
+    if x_total == 0:
+        return None
+
+    ratio = y_total / x_total
+
+    variance = 0.0
+    for population, sampled in measured:
+        n = len(sampled)
+        if n < 2:
+            continue
+        residuals = [y - ratio * x for y, x in sampled]
+        variance += population ** 2 * (1 - n / population) * statistics.variance(residuals) / n
+
+    margin = statistics.NormalDist().inv_cdf(0.5 + confidence / 2) * math.sqrt(variance) / x_total
+    return ratio - margin, ratio, ratio + margin
+
+
+def estimate_complexity(plan: SamplePlan, rows: list[tuple]) -> EstimateInterval | None:
+    # Mean block complexity: (sum of complexities, number of blocks) per file
+    values = {path: (0, 0) for path in plan.paths}
+    for path, _, _, complexity in rows:
+        total, blocks = values[path]
+        values[path] = (total + complexity, blocks + 1)
+
+    estimate = ratio_estimate(plan, values)
+    if estimate is None:
+        return None
+
+    lower, mean, upper = estimate
+    return EstimateInterval(
+        estimate=round(mean, 2),
+        lower=round(max(0.0, lower), 2),
+        upper=round(upper, 2)
+    )
+
+
+def estimate_pylint_score(
+    plan: SamplePlan,
+    penalties: dict[str, int],
+    statements: dict[str, int]
+) -> EstimateInterval | None:
+    """
+    pylint's score is 10 - 10 * (weighted messages / statements), so it
+    follows from the ratio of the two totals. Statements are counted from
+    the source index AST, which matches pylint's count closely.
+    """
+    values = {path: (penalty, statements.get(path, 0)) for path, penalty in penalties.items()}
+
+    estimate = ratio_estimate(plan, values)
+    if estimate is None:
+        return None
+
+    def score(ratio: float) -> float:
+        return round(min(10.0, max(0.0, 10.0 - 10.0 * ratio)), 2)
+
+    lower, ratio, upper = estimate
+    return EstimateInterval(estimate=score(ratio), lower=score(upper), upper=score(lower))
+
+
+def sampling_report(
+    plan: SamplePlan,
+    complexity: EstimateInterval | None,
+    pylint_score: EstimateInterval | None
+) -> SamplingReport:
+    return SamplingReport(
+        population_files=plan.population_size,
+        sample_files=len(plan.paths),
+        strata=len(plan.strata),
+        confidence=SAMPLING_CONFIDENCE,
+        pylint_score=pylint_score,
+        average_complexity=complexity
+    )
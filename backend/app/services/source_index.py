@@ -0,0 +1,256 @@
+import ast
+import io
+import time
+import tokenize
+from dataclasses import dataclass, field
+
+from backend.app.services.complexity_engine import analyze_tree_complexity, map_source_batches
+from backend.app.services.repo_scanner import RepoManifest
+from backend.app.services.sampling import SamplePlan, needs_sampling, plan_sample
+from backend.app.utils.metrics import STAGE_SECONDS, record_timing
+
+NON_CODE_TOKENS = {
+    tokenize.COMMENT,
+    tokenize.NL,
+    tokenize.NEWLINE,
+    tokenize.INDENT,
+    tokenize.DEDENT,
+    tokenize.ENDMARKER,
+    tokenize.ENCODING
+}
+
+
+@dataclass
+class PythonFileIndex:
+    path: str
+    parsed: bool = False
+    imports: list[str] = field(default_factory=list)
+    unused_imports: list[str] = field(default_factory=list)
+    functions: list[str] = field(default_factory=list)
+    classes: list[str] = field(default_factory=list)
+    test_functions: int = 0
+    test_classes: int = 0
+    has_module_docstring: bool = False
+    public_definitions: int = 0
+    documented_definitions: int = 0
+    total_lines: int = 0
+    code_lines: int = 0
+    comment_lines: int = 0
+    blank_lines: int = 0
+    statements: int = 0
+    # (path, block, line, complexity) rows from the same parse
+    complexity: list[tuple] = field(default_factory=list)
+    # Time radon spent on this file
+    complexity_seconds: float = 0.0
+
+
+def is_test_module(path: str) -> bool:
+    name = path.rsplit("/", 1)[-1].lower()
+    return name.startswith("test_") or name.endswith("_test.py") or name == "tests.py"
+
+
+def count_lines(source: str) -> tuple[int, int, int, int]:
+    """
+    (total, code, comment, blank) line counts. Lines inside multi-line
+    strings count as code; a line with code and a trailing comment is code.
+    """
+    lines = source.splitlines()
+    total = len(lines)
+
+    code_rows = set()
+    comment_rows = set()
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(source).readline):
+            if token.type == tokenize.COMMENT:
+                comment_rows.add(token.start[0])
+            elif token.type not in NON_CODE_TOKENS:
+                code_rows.update(range(token.start[0], token.end[0] + 1))
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        # Untokenizable sources: classify line by line
+        blank = sum(1 for l in lines if not l.strip())
+        comments = sum(1 for l in lines if l.strip().startswith("#"))
+        return total, total - blank - comments, comments, blank
+
+    comment_rows -= code_rows
+    blank = total - len(code_rows) - len(comment_rows)
+    return total, len(code_rows), len(comment_rows), blank
+
+
+def collect_imports(tree: ast.Module) -> tuple[list[str], dict[str, str]]:
+    """
+    Imported module names anywhere in the file, and the names bound by
+    module-level imports (bound name -> imported module).
+    """
+    imports = set()
+    bound = {}
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.add(alias.name)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            imports.add(node.module)
+
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                bound[alias.asname or alias.name.split(".")[0]] = alias.name
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name != "*":
+                    bound[alias.asname or alias.name] = node.module or "."
+
+    return sorted(imports), bound
+
+
+def find_unused_imports(tree: ast.Module, bound: dict[str, str]) -> list[str]:
+    used = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            used.add(node.id)
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            # Names listed in __all__ or used in string annotations
+            used.add(node.value)
+
+    return sorted(name for name in bound if name not in used)
+
+
+def is_test_class(node: ast.ClassDef, test_module: bool) -> bool:
+    # unittest cases count anywhere; pytest only collects Test* classes
+    # from test modules
+    for base in node.bases:
+        name = base.attr if isinstance(base, ast.Attribute) else getattr(base, "id", "")
+        if name.endswith("TestCase"):
+            return True
+    return test_module and node.name.startswith("Test")
+
+
+def index_python_source(path: str, source: str, complexity: bool = True) -> PythonFileIndex:
+    entry = PythonFileIndex(path=path)
+    entry.total_lines, entry.code_lines, entry.comment_lines, entry.blank_lines = count_lines(source)
+
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        # Python 2 and broken sources only get line counts, as radon and
+        # pylint skip them too
+        return entry
+
+    entry.parsed = True
+    entry.has_module_docstring = ast.get_docstring(tree) is not None
+    entry.statements = sum(1 for node in ast.walk(tree) if isinstance(node, ast.stmt))
+    entry.imports, bound = collect_imports(tree)
+    # Package __init__ files import names to re-export them
+    if not path.endswith("__init__.py"):
+        entry.unused_imports = find_unused_imports(tree, bound)
+
+    test_module = is_test_module(path)
+    definitions = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+    for node in tree.body:
+        if not isinstance(node, definitions):
+            continue
+
+        if isinstance(node, ast.ClassDef):
+            entry.classes.append(node.name)
+            if is_test_class(node, test_module):
+                entry.test_classes += 1
+                entry.test_functions += sum(
+                    1 for child in node.body
+                    if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))
+                    and child.name.startswith("test")
+                )
+        else:
+            entry.functions.append(node.name)
+            if test_module and node.name.startswith("test"):
+                entry.test_functions += 1
+
+        if not node.name.startswith("_"):
+            entry.public_definitions += 1
+            if ast.get_docstring(node) is not None:
+                entry.documented_definitions += 1
+
+    if complexity:
+        start = time.perf_counter()
+        entry.complexity = analyze_tree_complexity(path, tree)
+        entry.complexity_seconds = time.perf_counter() - start
+    return entry
+
+
+def _index_batch(batch: list[tuple[str, str, bool]]) -> list[PythonFileIndex]:
+    return [
+        index_python_source(path, source, complexity)
+        for path, source, complexity in batch
+    ]
+
+
+@dataclass
+class SourceIndex:
+    """
+    Facts about every Python file of one analysis, from a single read,
+    tokenize and parse per file. The analyzers query this instead of
+    reading and parsing sources themselves.
+    """
+    files: dict[str, PythonFileIndex]
+    # Files measured by radon and pylint when the repository is sampled
+    sample: SamplePlan | None = None
+
+    @property
+    def paths(self) -> list[str]:
+        return sorted(self.files)
+
+    def total(self, attribute: str) -> int:
+        return sum(getattr(f, attribute) for f in self.files.values())
+
+    def imports(self) -> set[str]:
+        # Top-level package names, e.g. "os.path" -> "os"
+        return {name.split(".")[0] for f in self.files.values() for name in f.imports}
+
+    def test_modules(self) -> list[PythonFileIndex]:
+        return [f for f in self.files.values() if f.test_functions or f.test_classes]
+
+    def complexity_rows(self) -> list[tuple]:
+        return [row for f in self.files.values() for row in f.complexity]
+
+    def docstring_coverage(self) -> float:
+        public = self.total("public_definitions")
+        if public == 0:
+            return 0.0
+        return round(self.total("documented_definitions") / public, 3)
+
+
+def collect_python_files(manifest: RepoManifest) -> list[str]:
+    return [
+        entry.path
+        for entry in manifest.files_with_ext(".py")
+        if "__pycache__" not in entry.path.split("/")
+    ]
+
+
+def build_source_index(manifest: RepoManifest, sample: bool = True) -> SourceIndex:
+    """
+    Indexes every Python file. Past the sampling thresholds complexity is
+    only computed for a stratified sample, which pylint then lints.
+    """
+    sources = [(path, manifest.read_text(path)) for path in collect_python_files(manifest)]
+
+    plan = None
+    total_lines = sum(source.count("\n") + 1 for _, source in sources)
+    if sample and needs_sampling(len(sources), total_lines):
+        plan = plan_sample({path: len(source) for path, source in sources})
+        print(f"[SAMPLING] {len(plan.paths)} of {len(sources)} Python files in {len(plan.strata)} strata")
+
+    measured = set(plan.paths) if plan else None
+    batch = [
+        (path, source, measured is None or path in measured)
+        for path, source in sources
+    ]
+    entries = map_source_batches(_index_batch, batch)
+
+    # radon runs inside the indexing workers, interleaved with parsing, so
+    # its per-file times are summed (CPU time across workers, not wall time)
+    radon_seconds = sum(e.complexity_seconds for e in entries)
+    STAGE_SECONDS.labels("radon").observe(radon_seconds)
+    record_timing("radon", radon_seconds)
+
+    return SourceIndex(files={e.path: e for e in entries}, sample=plan)
@@ -1,45 +1,35 @@
-import os
 from collections import defaultdict
 from backend.app.models.analysis_models import StructureAnalysis
+from backend.app.services.repo_scanner import RepoManifest
+from backend.app.services.source_index import SourceIndex
 
-def analyze_structure(repo_path: str) -> StructureAnalysis:
+def analyze_structure(manifest: RepoManifest, index: SourceIndex) -> StructureAnalysis:
     file_types = defaultdict(int)
-    total_files = 0
-    total_dirs = 0
     root_files = []
-    max_depth = 0
 
-    for root, dirs, files in os.walk(repo_path):
-        depth = root.replace(repo_path, "").count(os.sep)
-        max_depth = max(max_depth, depth)
-        total_dirs += len(dirs)
+    for entry in manifest.files:
+        file_types[entry.ext or "no_ext"] += 1
 
-        for file in files:
-            total_files += 1
-            ext = os.path.splitext(file)[1] or "no_ext"
-            file_types[ext] += 1
-
-            if root == repo_path:
-                root_files.append(file)
+        if entry.depth == 1:
+            root_files.append(entry.name)
 
+    max_depth = max((d.depth for d in manifest.directories), default=0)
 
     has_readme = any(
         f.lower().startswith("readme") for f in root_files
     )
 
     has_tests = any(
-        d.lower() in ["tests", "test", "__tests__"]
-        for d in os.listdir(repo_path)
-        if os.path.isdir(os.path.join(repo_path, d))
-    )
+        d.name.lower() in ["tests", "test", "__tests__"]
+        for d in manifest.directories
+        if d.depth == 1
+    ) or bool(index.test_modules())
 
-    has_ci = os.path.exists(
-        os.path.join(repo_path, ".github", "workflows")
-    )
+    has_ci = manifest.exists(".github/workflows")
 
     return StructureAnalysis(
-        total_files=total_files,
-        total_directories=total_dirs,
+        total_files=len(manifest.files),
+        total_directories=len(manifest.directories),
         file_types=dict(file_types),
         has_readme=has_readme,
         has_tests=has_tests,
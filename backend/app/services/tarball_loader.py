@@ -0,0 +1,89 @@
+import os
+import tarfile
+
+from backend.app.config import TARBALL_MAX_FILE_BYTES, TARBALL_MAX_TOTAL_BYTES
+from backend.app.services.github_client import github_stream
+from backend.app.services.repo_scanner import (
+    PRUNED_DIRS,
+    FileEntry,
+    RepoManifest,
+    order_entries
+)
+from backend.app.utils.deadline import abort_at_deadline
+
+BINARY_SNIFF_BYTES = 8192
+
+
+def is_binary(data: bytes) -> bool:
+    return b"\0" in data[:BINARY_SNIFF_BYTES]
+
+
+def load_repository_tarball(owner: str, repo: str, ref: str | None = None) -> RepoManifest:
+    """
+    Streams the repository tarball at ref (default branch HEAD when None)
+    and builds an in-memory manifest from it, without git or disk writes.
+    Every file is listed with its size; only text files up to
+    TARBALL_MAX_FILE_BYTES keep their contents.
+    """
+    path = f"/repos/{owner}/{repo}/tarball"
+    if ref:
+        path = f"{path}/{ref}"
+
+    entries = {}
+    contents = {}
+    stored_bytes = 0
+
+    with github_stream(path) as response:
+        if response.status_code != 200:
+            raise Exception(f"Failed to download repository tarball ({response.status_code})")
+
+        response.raw.decode_content = True
+
+        # "r|gz" reads the archive sequentially straight off the socket;
+        # closing the response at the deadline aborts the download
+        with abort_at_deadline(response.close), \
+                tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+            for member in archive:
+                # GitHub wraps everything in a single "<owner>-<repo>-<sha>/" folder
+                _, _, rel_path = member.name.partition("/")
+                rel_path = rel_path.strip("/")
+                if not rel_path:
+                    continue
+
+                parts = rel_path.split("/")
+                if any(p in PRUNED_DIRS for p in parts):
+                    continue
+
+                # Parent folders are not guaranteed to have their own member
+                for depth in range(1, len(parts)):
+                    parent = "/".join(parts[:depth])
+                    if parent not in entries:
+                        entries[parent] = FileEntry(parent, parts[depth - 1], "", 0, depth, True)
+
+                name = parts[-1]
+                if member.isdir():
+                    entries[rel_path] = FileEntry(rel_path, name, "", 0, len(parts), True)
+                    continue
+
+                ext = os.path.splitext(name)[1]
+                size = member.size if member.isfile() else 0
+                entries[rel_path] = FileEntry(rel_path, name, ext, size, len(parts), False)
+
+                if not member.isfile() or size > TARBALL_MAX_FILE_BYTES:
+                    continue
+
+                data = archive.extractfile(member).read()
+                if is_binary(data):
+                    continue
+
+                stored_bytes += len(data)
+                if stored_bytes > TARBALL_MAX_TOTAL_BYTES:
+                    raise Exception("Repository is too large to analyze in memory")
+
+                contents[rel_path] = data.decode("utf-8", errors="ignore")
+
+    return RepoManifest(
+        root=None,
+        entries=order_entries(list(entries.values())),
+        contents=contents
+    )
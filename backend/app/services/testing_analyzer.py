@@ -1,68 +1,78 @@
-import os
 from backend.app.models.analysis_models import TestingAnalysis
+from backend.app.services.repo_scanner import RepoManifest
+from backend.app.services.source_index import SourceIndex
 
 TEST_DIR_NAMES = ["tests", "test", "__tests__"]
 
-def find_test_directories(repo_path: str) -> list[str]:
-    found = []
-    for root, dirs, files in os.walk(repo_path):
-        for d in dirs:
-            if d.lower() in TEST_DIR_NAMES:
-                found.append(os.path.join(root, d))
-    return found
+def find_test_directories(manifest: RepoManifest) -> list[str]:
+    return [
+        d.path for d in manifest.directories
+        if d.name.lower() in TEST_DIR_NAMES
+    ]
 
-def count_test_files(test_dirs: list[str]) -> int:
+def count_test_files(manifest: RepoManifest, test_dirs: list[str]) -> int:
+    prefixes = tuple(d + "/" for d in test_dirs)
     count = 0
-    for d in test_dirs:
-        for root, _, files in os.walk(d):
-            for f in files:
-                if f.lower().startswith("test") or f.lower().endswith("_test.py"):
-                    count += 1
+    for entry in manifest.files:
+        if not entry.path.startswith(prefixes):
+            continue
+        name = entry.name.lower()
+        if name.startswith("test") or name.endswith("_test.py"):
+            count += 1
     return count
 
-def detect_test_frameworks(repo_path: str) -> list[str]:
+PYTEST_CONFIG_FILES = {"pytest.ini", "conftest.py"}
+PYTEST_CONFIG_SECTIONS = {
+    "pyproject.toml": "[tool.pytest",
+    "setup.cfg": "[tool:pytest]",
+    "tox.ini": "[pytest]"
+}
+
+
+def detect_test_frameworks(manifest: RepoManifest, index: SourceIndex) -> list[str]:
+    # Real imports rather than the word appearing in comments or docstrings
+    imports = index.imports()
     frameworks = set()
 
-    for root, _, files in os.walk(repo_path):
-        for file in files:
-            if file.endswith(".py"):
-                try:
-                    with open(os.path.join(root, file), "r", encoding="utf-8", errors="ignore") as f:
-                        content = f.read().lower()
-                        if "pytest" in content:
-                            frameworks.add("pytest")
-                        if "unittest" in content:
-                            frameworks.add("unittest")
-                except Exception:
-                    pass
+    if "pytest" in imports or any(e.name in PYTEST_CONFIG_FILES for e in manifest.files):
+        frameworks.add("pytest")
+    if "unittest" in imports:
+        frameworks.add("unittest")
+
+    # Plain-assert pytest suites may only be visible in the configuration
+    if "pytest" not in frameworks:
+        for name, section in PYTEST_CONFIG_SECTIONS.items():
+            if manifest.exists(name) and section in manifest.read_text(name):
+                frameworks.add("pytest")
+                break
 
-    return list(frameworks)
+    return sorted(frameworks)
 
 
-def detect_coverage(repo_path: str) -> bool:
+def detect_coverage(manifest: RepoManifest) -> bool:
     coverage_files = [
         "coverage.xml",
         ".coverage",
         "htmlcov"
     ]
 
-    for root, dirs, files in os.walk(repo_path):
-        for item in files + dirs:
-            if item in coverage_files:
-                return True
-    return False
+    return any(e.name in coverage_files for e in manifest.entries)
 
 
-def analyze_testing(repo_path: str) -> TestingAnalysis:
-    test_dirs = find_test_directories(repo_path)
-    test_files = count_test_files(test_dirs)
-    frameworks = detect_test_frameworks(repo_path)
-    has_coverage = detect_coverage(repo_path)
+def analyze_testing(manifest: RepoManifest, index: SourceIndex) -> TestingAnalysis:
+    test_dirs = find_test_directories(manifest)
+    test_files = count_test_files(manifest, test_dirs)
+    frameworks = detect_test_frameworks(manifest, index)
+    has_coverage = detect_coverage(manifest)
+    test_functions = index.total("test_functions")
 
     return TestingAnalysis(
-        has_tests=len(test_dirs) > 0,
+        # Test modules next to the code count as tests too
+        has_tests=len(test_dirs) > 0 or test_functions > 0,
         test_directories=test_dirs,
         test_files_count=test_files,
         test_frameworks=frameworks,
-        has_coverage=has_coverage
+        has_coverage=has_coverage,
+        test_functions_count=test_functions,
+        test_classes_count=index.total("test_classes")
     )
@@ -0,0 +1,86 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+# Monotonic time by which the current analysis must finish. Pipeline
+# stages see it through their copied context; work handed to other pools
+# receives it explicitly.
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+@contextmanager
+def request_deadline(seconds: float | None):
+    # Batch and job workers are reused threads, so the deadline is reset
+    # when the analysis ends instead of leaking into the next one
+    token = _deadline.set(time.monotonic() + seconds if seconds else None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> float | None:
+    return _deadline.get()
+
+
+def deadline_expired(deadline: float | None = None) -> bool:
+    deadline = deadline if deadline is not None else _deadline.get()
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def time_left(cap: float | None = None, deadline: float | None = None) -> float | None:
+    """
+    How long a blocking call may take: cap, shortened to the time left
+    before the deadline (None when neither applies). Raises
+    DeadlineExceeded once the deadline has passed.
+    """
+    deadline = deadline if deadline is not None else _deadline.get()
+    if deadline is None:
+        return cap
+
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return left if cap is None else min(cap, left)
+
+
+@contextmanager
+def abort_at_deadline(abort: Callable[[], None]):
+    """
+    Calls abort (e.g. killing a child process or closing a streamed HTTP
+    response) if the deadline passes while the block is still running,
+    then raises DeadlineExceeded instead of returning a truncated result.
+    """
+    left = time_left()
+    if left is None:
+        yield
+        return
+
+    fired = threading.Event()
+
+    def expire():
+        fired.set()
+        abort()
+
+    timer = threading.Timer(left, expire)
+    timer.daemon = True
+    timer.start()
+    try:
+        yield
+    except Exception:
+        # Whatever the abort broke (a read on a closed socket, ...)
+        if fired.is_set():
+            raise DeadlineExceeded("Request deadline exceeded")
+        raise
+    finally:
+        timer.cancel()
+
+    if fired.is_set():
+        raise DeadlineExceeded("Request deadline exceeded")
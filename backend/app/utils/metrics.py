@@ -0,0 +1,97 @@
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# From a cached result (milliseconds) to a full pylint run (minutes)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+STAGE_SECONDS = Histogram(
+    "repoai_stage_duration_seconds",
+    "Duration of analysis pipeline stages and their steps (clone, radon, pylint, ...)",
+    ["stage"],
+    buckets=LATENCY_BUCKETS
+)
+LLM_CALL_SECONDS = Histogram(
+    "repoai_llm_call_duration_seconds",
+    "Duration of LLM calls, including completion cache hits",
+    ["call", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+GITHUB_CALL_SECONDS = Histogram(
+    "repoai_github_call_duration_seconds",
+    "Duration of GitHub API calls by endpoint and status",
+    ["endpoint", "status"],
+    buckets=LATENCY_BUCKETS
+)
+
+CACHE_EVENTS = Counter(
+    "repoai_cache_events_total",
+    "Cache lookups by cache and result (hit tier or miss)",
+    ["cache", "result"]
+)
+FALLBACKS = Counter(
+    "repoai_fallbacks_total",
+    "Fallback results used instead of a failed or late stage",
+    ["stage"]
+)
+GITHUB_ERRORS = Counter(
+    "repoai_github_errors_total",
+    "GitHub calls that failed, by status code or error type",
+    ["reason"]
+)
+
+ANALYSES_IN_FLIGHT = Gauge(
+    "repoai_analyses_in_flight",
+    "Analyses whose pipeline is currently running"
+)
+GITHUB_RATE_LIMIT_REMAINING = Gauge(
+    "repoai_github_rate_limit_remaining",
+    "Requests left across all GitHub tokens, by rate limit resource",
+    ["resource"]
+)
+
+# Stage durations of the current HTTP request, for its Server-Timing header
+_request_timings: ContextVar[dict | None] = ContextVar("request_timings", default=None)
+
+_OWNER_REPO_RE = re.compile(r"^/repos/[^/]+/[^/]+")
+_ACCOUNT_RE = re.compile(r"^/(users|orgs)/[^/]+")
+
+
+def start_request_timings() -> dict:
+    timings = {}
+    _request_timings.set(timings)
+    return timings
+
+
+def record_timing(name: str, seconds: float) -> None:
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+@contextmanager
+def timed_stage(stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.labels(stage).observe(elapsed)
+        record_timing(stage, elapsed)
+
+
+def format_server_timing(timings: dict) -> str:
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items())
+
+
+def github_endpoint(path: str) -> str:
+    # Owner, repository and user names would make the label unbounded
+    path = path.split("?", 1)[0]
+    path = _OWNER_REPO_RE.sub("/repos/{owner}/{repo}", path)
+    path = _ACCOUNT_RE.sub(r"/\1/{name}", path)
+    if "/tarball/" in path:
+        path = path.split("/tarball/", 1)[0] + "/tarball/{ref}"
+    return path
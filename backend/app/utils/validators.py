@@ -4,3 +4,8 @@ GITHUB_REPO_REGEX = r"^https:\/\/github\.com\/[^\/]+\/[^\/]+\/?$"
 
 def validate_github_repo_url(url: str) -> bool:
     return re.match(GITHUB_REPO_REGEX, url) is not None
+
+GITHUB_ACCOUNT_REGEX = r"^[A-Za-z0-9](?:[A-Za-z0-9-]{0,38})$"
+
+def validate_github_account(name: str) -> bool:
+    return re.match(GITHUB_ACCOUNT_REGEX, name) is not None
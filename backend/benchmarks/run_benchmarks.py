@@ -0,0 +1,210 @@
+"""
+Offline benchmarks for the analyzers on synthetic repositories.
+
+    python -m backend.benchmarks.run_benchmarks --sizes small medium \
+        --output data/benchmarks/latest.json --baseline data/benchmarks/baseline.json
+
+Exits with status 1 when a timing or memory figure regresses past the
+tolerance compared to the baseline file.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from backend.benchmarks.synthetic_repo import PRESETS, TEST_LAYOUTS, RepoSpec, generate_repo
+from backend.app.core.scoring_engine import calculate_final_score
+from backend.app.models.analysis_models import GitPracticesAnalysis
+from backend.app.services.repo_scanner import scan_repository
+from backend.app.services.source_index import build_source_index
+from backend.app.services.structure_analyzer import analyze_structure
+from backend.app.services.code_quality_analyzer import analyze_code_quality
+from backend.app.services.documentation_analyzer import analyze_documentation
+from backend.app.services.testing_analyzer import analyze_testing
+
+# Timing differences below this are noise, not regressions
+MIN_SIGNIFICANT_SECONDS = 0.001
+
+# Git practices need the network, so scoring uses a fixed stand-in
+SYNTHETIC_GIT_PRACTICES = GitPracticesAnalysis(
+    total_commits=120,
+    recent_activity_days=3,
+    commit_message_quality="good",
+    has_multiple_branches=True,
+    has_pull_requests=True,
+    is_actively_maintained=True
+)
+
+
+def measure(func, repeats: int, warmup: int) -> dict:
+    """
+    Wall time over repeats runs (after warmup runs that start pools and
+    fill OS caches), then one traced run for the peak Python heap. Memory
+    of pylint subprocesses and radon workers is not included.
+    """
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_seconds": round(statistics.median(timings), 6),
+        "min_seconds": round(min(timings), 6),
+        "max_seconds": round(max(timings), 6),
+        "peak_memory_bytes": peak,
+        "repeats": repeats
+    }
+
+
+def benchmark_repo(root: str, repeats: int, warmup: int) -> dict:
+    manifest = scan_repository(root)
+    index = build_source_index(manifest)
+    structure = analyze_structure(manifest, index)
+    code = analyze_code_quality(manifest, index)
+    doc = analyze_documentation(manifest, index)
+    testing = analyze_testing(manifest, index)
+
+    cases = {
+        "scan_repository": lambda: scan_repository(root),
+        "build_source_index": lambda: build_source_index(manifest),
+        "analyze_structure": lambda: analyze_structure(manifest, index),
+        "analyze_code_quality": lambda: analyze_code_quality(manifest, index),
+        "analyze_documentation": lambda: analyze_documentation(manifest, index),
+        "analyze_testing": lambda: analyze_testing(manifest, index),
+        "calculate_final_score": lambda: calculate_final_score(
+            structure, code, doc, testing, SYNTHETIC_GIT_PRACTICES
+        ),
+    }
+
+    results = {}
+    for name, func in cases.items():
+        print(f"[BENCHMARK] {name}")
+        results[name] = measure(func, repeats, warmup)
+
+    results["_repo"] = {
+        "files": len(manifest.files),
+        "directories": len(manifest.directories),
+        "python_files": code.total_code_files,
+        "lines_of_code": code.total_lines_of_code
+    }
+    return results
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Lists every benchmark whose median time or peak memory grew by more
+    than tolerance (0.2 = 20%) compared to the baseline.
+    """
+    regressions = []
+
+    for size, cases in current["results"].items():
+        base_cases = baseline.get("results", {}).get(size, {})
+        for name, result in cases.items():
+            base = base_cases.get(name)
+            if name.startswith("_") or not base:
+                continue
+
+            for metric in ("median_seconds", "peak_memory_bytes"):
+                if metric == "median_seconds" and result[metric] < MIN_SIGNIFICANT_SECONDS:
+                    continue
+                if base[metric] and result[metric] > base[metric] * (1 + tolerance):
+                    change = (result[metric] / base[metric] - 1) * 100
+                    regressions.append(
+                        f"{size}/{name} {metric}: {base[metric]} -> {result[metric]} (+{change:.0f}%)"
+                    )
+
+    return regressions
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the RepoAI analyzers offline")
+    parser.add_argument("--sizes", nargs="+", default=["small", "medium"], choices=sorted(PRESETS))
+    parser.add_argument("--files", type=int, default=None,
+                        help="Override the file count of every preset")
+    parser.add_argument("--max-depth", type=int, default=None,
+                        help="Override the directory depth of every preset")
+    parser.add_argument("--readme-kb", type=int, default=None,
+                        help="Override the README size (KiB) of every preset")
+    parser.add_argument("--test-layout", choices=TEST_LAYOUTS, default=None,
+                        help="Override the test layout of every preset")
+    parser.add_argument("--python-share", type=float, default=None,
+                        help="Override the share of Python files of every preset")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="data/benchmarks/latest.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "specs": {},
+        "results": {}
+    }
+
+    for size in args.sizes:
+        spec = RepoSpec(**{**PRESETS[size].to_dict(), "seed": args.seed})
+        if args.files is not None:
+            spec.files = args.files
+        if args.max_depth is not None:
+            spec.max_depth = args.max_depth
+        if args.readme_kb is not None:
+            spec.readme_kb = args.readme_kb
+        if args.test_layout:
+            spec.test_layout = args.test_layout
+        if args.python_share is not None:
+            spec.python_share = args.python_share
+
+        with tempfile.TemporaryDirectory(prefix=f"repoai-bench-{size}-") as root:
+            print(f"[BENCHMARK] generating {size} repository ({spec.files} files)")
+            generate_repo(root, spec)
+            report["specs"][size] = spec.to_dict()
+            report["results"][size] = benchmark_repo(root, args.repeats, args.warmup)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[BENCHMARK] results written to {args.output}")
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    regressions = compare(report, baseline, args.tolerance)
+    for line in regressions:
+        print(f"[BENCHMARK] REGRESSION {line}")
+    if not regressions:
+        print(f"[BENCHMARK] no regressions beyond {args.tolerance:.0%} of {args.baseline}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,169 @@
+import os
+import random
+from dataclasses import dataclass, asdict
+
+TEST_LAYOUTS = ("tests_dir", "colocated", "none")
+
+OTHER_EXTENSIONS = (".md", ".txt", ".json", ".yml", ".js", ".html", ".cfg")
+
+README_SECTIONS = (
+    "Overview", "Installation", "Usage", "Architecture", "Configuration",
+    "Contributing", "Changelog", "License"
+)
+
+WORDS = (
+    "repository analysis pipeline module service request response cache "
+    "worker score metric report parser handler client server config data "
+    "value result stage engine token commit branch file directory"
+).split()
+
+
+@dataclass
+class RepoSpec:
+    files: int = 200
+    max_depth: int = 4
+    python_share: float = 0.6
+    readme_kb: int = 8
+    test_layout: str = "tests_dir"
+    with_ci: bool = True
+    seed: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+# Named sizes used by the benchmark runner
+PRESETS = {
+    "small": RepoSpec(files=50, max_depth=3, readme_kb=4),
+    "medium": RepoSpec(files=400, max_depth=5, readme_kb=16),
+    "large": RepoSpec(files=2000, max_depth=7, readme_kb=64),
+}
+
+
+def sentence(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def python_module(rng: random.Random, index: int) -> str:
+    """
+    A module with a docstring, imports and functions of varying cyclomatic
+    complexity, so radon and pylint have realistic work to do.
+    """
+    lines = [
+        f'"""{sentence(rng)}"""',
+        "import os",
+        "import json",
+        "",
+    ]
+
+    for f in range(rng.randint(2, 8)):
+        branches = rng.choice((0, 1, 2, 4, 8, 16))
+        lines.append("")
+        lines.append(f"def function_{index}_{f}(value, items):")
+        lines.append(f'    """{sentence(rng, 8)}"""')
+        lines.append("    total = 0")
+        for b in range(branches):
+            keyword = "if" if b == 0 else "elif"
+            lines.append(f"    {keyword} value == {b}:")
+            lines.append(f"        total += len(items) * {b}")
+        if branches:
+            lines.append("    else:")
+            lines.append("        total = -1")
+        lines.append("    for item in items:")
+        lines.append("        total += len(str(item))")
+        lines.append("    return total")
+
+    if rng.random() < 0.5:
+        lines.append("")
+        lines.append("")
+        lines.append(f"class Handler{index}:")
+        lines.append(f'    """{sentence(rng, 6)}"""')
+        lines.append("")
+        lines.append("    def __init__(self, path):")
+        lines.append("        self.path = os.path.abspath(path)")
+        lines.append("")
+        lines.append("    def load(self):")
+        lines.append("        with open(self.path, encoding='utf-8') as f:")
+        lines.append("            return json.load(f)")
+
+    return "\n".join(lines) + "\n"
+
+
+def test_module(rng: random.Random, index: int) -> str:
+    lines = ["import pytest", ""]
+    for t in range(rng.randint(1, 5)):
+        lines.append("")
+        lines.append(f"def test_case_{index}_{t}():")
+        lines.append(f"    assert {t} + 1 == {t + 1}")
+    return "\n".join(lines) + "\n"
+
+
+def readme(rng: random.Random, size_kb: int) -> str:
+    parts = ["# Synthetic Project", "", "[![build](https://img.shields.io/x)](https://ci)", ""]
+    target = size_kb * 1024
+
+    while sum(len(p) + 1 for p in parts) < target:
+        for title in README_SECTIONS:
+            parts.append(f"## {title}")
+            parts.append("")
+            for _ in range(rng.randint(2, 6)):
+                parts.append(sentence(rng, rng.randint(10, 30)))
+            if title in ("Installation", "Usage"):
+                parts.extend(["", "```bash", "pip install synthetic", "python -m synthetic", "```"])
+            parts.append("")
+
+    return "\n".join(parts)
+
+
+def random_dir(rng: random.Random, max_depth: int) -> str:
+    depth = rng.randint(0, max(0, max_depth - 1))
+    return os.path.join(*(["src"] + [f"pkg{rng.randint(0, 5)}" for _ in range(depth)]))
+
+
+def write(root: str, rel_path: str, text: str) -> None:
+    path = os.path.join(root, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def generate_repo(root: str, spec: RepoSpec) -> None:
+    """
+    Writes a deterministic (per seed) synthetic repository to root with
+    spec.files files, including the README, CI workflow and tests.
+    """
+    if spec.test_layout not in TEST_LAYOUTS:
+        raise ValueError(f"test_layout must be one of {TEST_LAYOUTS}")
+
+    rng = random.Random(spec.seed)
+    os.makedirs(root, exist_ok=True)
+
+    write(root, "README.md", readme(rng, spec.readme_kb))
+    write(root, "requirements.txt", "pytest\ncoverage\n")
+    written = 2
+
+    if spec.with_ci:
+        write(root, ".github/workflows/ci.yml", "on: push\njobs: {}\n")
+        written += 1
+
+    remaining = max(0, spec.files - written)
+    python_files = int(remaining * spec.python_share)
+    test_files = 0 if spec.test_layout == "none" else max(1, python_files // 5)
+    source_files = max(0, python_files - test_files)
+    other_files = remaining - source_files - test_files
+
+    for i in range(source_files):
+        directory = random_dir(rng, spec.max_depth)
+        write(root, os.path.join(directory, f"module_{i}.py"), python_module(rng, i))
+
+        if spec.test_layout == "colocated" and i < test_files:
+            write(root, os.path.join(directory, f"test_module_{i}.py"), test_module(rng, i))
+
+    if spec.test_layout == "tests_dir":
+        for i in range(test_files):
+            write(root, os.path.join("tests", f"test_module_{i}.py"), test_module(rng, i))
+
+    for i in range(other_files):
+        ext = rng.choice(OTHER_EXTENSIONS)
+        directory = rng.choice(("docs", "assets", random_dir(rng, spec.max_depth)))
+        write(root, os.path.join(directory, f"file_{i}{ext}"), sentence(rng, 40) + "\n")
@@ -1,10 +1,15 @@
+import time
+
 import streamlit as st
 import requests
 
 # ==============================
 # CONFIG
 # ==============================
-BACKEND_URL = "https://repoai.onrender.com/analyze/"
+BACKEND_BASE_URL = "https://repoai.onrender.com"
+JOBS_URL = f"{BACKEND_BASE_URL}/analyze/jobs"
+POLL_INTERVAL_SECONDS = 2
+MAX_WAIT_SECONDS = 900
 
 st.set_page_config(
     page_title="Repo Mirror AI",
@@ -54,15 +59,37 @@ if analyze_btn:
         with st.spinner("Analyzing repository... This may take a few seconds."):
             try:
                 response = requests.post(
-                    BACKEND_URL,
+                    JOBS_URL,
                     json={"repo_url": repo_url},
-                    timeout=120
+                    timeout=30
                 )
 
-                if response.status_code != 200:
+                if response.status_code != 202:
                     st.error(f"Backend error: {response.text}")
                 else:
-                    st.session_state.data = response.json()
+                    status_url = f"{BACKEND_BASE_URL}{response.json()['status_url']}"
+                    progress = st.empty()
+                    started = time.time()
+
+                    # Poll the job instead of holding one long request open
+                    while time.time() - started < MAX_WAIT_SECONDS:
+                        job = requests.get(status_url, timeout=30).json()
+
+                        done = [s for s, v in job["stages"].items() if v != "running"]
+                        progress.caption(f"Status: {job['status']} — finished stages: {', '.join(done) or 'none'}")
+
+                        if job["status"] == "completed":
+                            st.session_state.data = job["result"]
+                            break
+                        if job["status"] == "failed":
+                            st.error(f"Backend error: {job['error']['detail']}")
+                            break
+
+                        time.sleep(POLL_INTERVAL_SECONDS)
+                    else:
+                        st.error("Analysis is taking too long. Please try again later.")
+
+                    progress.empty()
 
             except requests.exceptions.RequestException as e:
                 st.error(f"Failed to connect to backend: {e}")
@@ -92,7 +119,8 @@ if data:
     # ==============================
     st.subheader("📘 Repository Overview & Working")
 
-    overview = data.get("project_overview", {})
+    # Fields a deadline or a skipped analyzer left out come back as None
+    overview = data.get("project_overview") or {}
 
     with st.container(border=True):
 
@@ -127,7 +155,7 @@ if data:
     # SUMMARY
     # ==============================
     st.subheader("🧠 Professional Evaluation Summary")
-    st.write(data["summary"])
+    st.write(data.get("summary") or "Summary not available.")
 
     st.divider()
 
@@ -136,7 +164,7 @@ if data:
     # ==============================
     st.subheader("🛠️ Personalized Improvement Roadmap")
 
-    roadmap_items = data["roadmap"]["items"]
+    roadmap_items = (data.get("roadmap") or {}).get("items", [])
 
     if not roadmap_items:
         st.info("No roadmap items generated.")